@@ -1,35 +1,52 @@
 """
 FastAPI Backend Server — BestTime Crowd API + Elderly Mode
 Run: uvicorn main:app --reload --port 8000
+Prod: ./start.sh  (gunicorn + uvicorn workers, WEB_CONCURRENCY to override)
+Profile: make profile  (Scalene with async attribution -> profile.json)
 Docs: http://localhost:8000/docs
 """
 
 import os
+import time
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 
+import aiohttp
 from dotenv import load_dotenv
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
+from services import _geo_cache
 from services.besttime import BestTimeClient
+from services.foursquare import close_client as close_mapbox_client
+from services.cache import ResponseCache
 from routers import crowd, elderly, child, foursquare, chatbot
 
 load_dotenv()
 
+# ── Event loop ────────────────────────────────────────────────
+# uvloop is much faster than the default selector loop for the many outbound
+# HTTP calls we make. It has no Windows support, so fall back silently there.
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # ── Logging ────────────────────────────────────────────────────
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
 )
-
-# ── Global BestTime client ────────────────────────────────────
-besttime_client: BestTimeClient | None = None
-
+logger = logging.getLogger(__name__)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global besttime_client
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__name__}")
     private_key = os.getenv("BESTTIME_API_KEY_PRIVATE", "")
     public_key = os.getenv("BESTTIME_API_KEY_PUBLIC", "")
 
@@ -38,9 +55,28 @@ async def lifespan(app: FastAPI):
     if not public_key:
         print("[WARNING] BESTTIME_API_KEY_PUBLIC not set -- forecast queries will fail.")
 
-    besttime_client = BestTimeClient(private_key, public_key)
+    # Shared BestTime client, handed to routers via request.app.state
+    app.state.besttime = BestTimeClient(private_key, public_key)
+
+    # Long-lived Gemini session — one connection pool per worker
+    app.state.gemini_session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=30),
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+    )
+
+    # Optional Redis response cache — disabled when REDIS_URL is unset
+    app.state.cache = ResponseCache(os.getenv("REDIS_URL"))
+    if not app.state.cache.is_configured:
+        print("[INFO] REDIS_URL not set -- upstream responses will not be cached.")
+
+    # Geocoding cache survives restarts via a JSON file
+    _geo_cache.load()
     yield
-    await besttime_client.close()
+    _geo_cache.save()
+    await close_mapbox_client()
+    await app.state.cache.close()
+    await app.state.gemini_session.close()
+    await app.state.besttime.close()
 
 
 # ── App ───────────────────────────────────────────────────────
@@ -49,17 +85,59 @@ app = FastAPI(
     description="BestTime API integration for crowd/traffic data and elderly-friendly travel suggestions.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# CORS — allow the Vite dev server (any common dev port)
+# CORS — explicit origins (comma-separated CORS_ORIGINS), defaulting to the
+# Vite dev server. Browsers reject "*" together with credentials anyway.
+CORS_ORIGINS = [
+    o.strip()
+    for o in os.getenv("CORS_ORIGINS", "http://localhost:8080,http://localhost:5173").split(",")
+    if o.strip()
+]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+
+# Gzip JSON responses over 1 KB (itinerary analyses run to hundreds of KB).
+# SSE endpoints are skipped — gzip buffers output, which would hold back
+# streamed chunks until the compressor flushes.
+class StreamAwareGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(StreamAwareGZipMiddleware, minimum_size=1024)
+
+
+# Request timing — total wall time vs CPU time on the event-loop thread, so
+# logs show whether a route is waiting on upstream APIs or burning Python.
+# CPU time is per-thread, so under concurrency it includes other requests'
+# work interleaved on the loop; treat await_pct as a lower bound.
+@app.middleware("http")
+async def timing(request: Request, call_next):
+    request.state.t0 = time.perf_counter()
+    cpu0 = time.thread_time()
+    response = await call_next(request)
+    total = time.perf_counter() - request.state.t0
+    cpu = min(time.thread_time() - cpu0, total)
+    await_pct = 100 * (total - cpu) / total if total else 0.0
+    response.headers["Server-Timing"] = f"total;dur={total * 1000:.1f}, cpu;dur={cpu * 1000:.1f}"
+    logger.info(
+        f"route={request.url.path} method={request.method} status={response.status_code} "
+        f"total_ms={total * 1000:.1f} cpu_ms={cpu * 1000:.1f} await_pct={await_pct:.0f}"
+    )
+    return response
+
+
 # ── Register routers ─────────────────────────────────────────
 app.include_router(crowd.router)
 app.include_router(elderly.router)
@@ -83,4 +161,9 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "ok", "besttime_configured": bool(os.getenv("BESTTIME_API_KEY_PRIVATE"))}
+    return {
+        "status": "ok",
+        "besttime_configured": bool(os.getenv("BESTTIME_API_KEY_PRIVATE")),
+        "cache_configured": app.state.cache.is_configured,
+        "cache_stats": dict(app.state.cache.stats),
+    }
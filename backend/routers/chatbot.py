@@ -1,13 +1,20 @@
 """
 Chatbot router – calls Google Gemini API directly (no edge functions).
 """
-from fastapi import APIRouter
-from pydantic import BaseModel
-import httpx, os
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+import aiohttp, hashlib, orjson, os
+
+from services.cache import ResponseCache
 
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent"
+CHAT_CACHE_TTL = 3600  # seconds
+
+_NO_KEY_ERROR = "GEMINI_API_KEY not set in backend/.env — add it to enable the chatbot."
 
 SYSTEM_PROMPT = """You are RoamIQ Travel Assistant — a friendly, knowledgeable travel chatbot.
 You help travelers with:
@@ -21,10 +28,45 @@ Keep responses concise (2-4 paragraphs max), warm, and practical.
 Use relevant emojis sparingly. If you don't know something, say so honestly.
 Always be helpful and enthusiastic about travel!"""
 
+# Static prefix of every Gemini conversation — built once, shared by all requests
+_BASE_CONTENTS: tuple[dict, ...] = (
+    {"role": "user", "parts": [{"text": SYSTEM_PROMPT}]},
+    {"role": "model", "parts": [{"text": "Understood! I'm RoamIQ Travel Assistant, ready to help with all your travel questions. 🌍"}]},
+)
+
+_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "maxOutputTokens": 512,
+    "topP": 0.9,
+}
+
+# The request body up to the per-chat messages, serialized once at import.
+# Each request only encodes its history + message and splices them on.
+_BODY_HEAD = (
+    b'{"generationConfig":' + orjson.dumps(_GENERATION_CONFIG)
+    + b',"contents":[' + b",".join(orjson.dumps(c) for c in _BASE_CONTENTS)
+)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# ── Dependency to get the shared Gemini session ──────────────
+def get_gemini_session(request: Request) -> aiohttp.ClientSession:
+    return request.app.state.gemini_session
+
+
+def get_cache(request: Request) -> ResponseCache:
+    return request.app.state.cache
+
+
+# Only the last HISTORY_WINDOW turns reach Gemini; anything past MAX_HISTORY is
+# rejected with a 422 before the handler runs, so oversized payloads are cheap.
+HISTORY_WINDOW = 10
+MAX_HISTORY = 50
+
 
 class ChatRequest(BaseModel):
-    message: str
-    history: list[dict] = []
+    message: str = Field(..., max_length=4000)
+    history: list[dict] = Field(default_factory=list, max_length=MAX_HISTORY)
 
 
 class ChatResponse(BaseModel):
@@ -32,46 +74,115 @@ class ChatResponse(BaseModel):
     error: str | None = None
 
 
+def _build_request(req: ChatRequest) -> tuple[bytes, str]:
+    """Build the serialized Gemini request body and its response-cache key."""
+    contents = [
+        {"role": "user" if msg.get("role") == "user" else "model", "parts": [{"text": msg.get("content", "")}]}
+        for msg in req.history[-HISTORY_WINDOW:]
+    ]
+    contents.append({"role": "user", "parts": [{"text": req.message}]})
+
+    body = _BODY_HEAD + b"," + orjson.dumps(contents)[1:-1] + b"]}"
+
+    # Identical prompt + history + config → identical reply, skip Gemini
+    cache_key = "chat:" + hashlib.blake2b(body, digest_size=16).hexdigest()
+    return body, cache_key
+
+
+def _sse(payload) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
 @router.post("/", response_model=ChatResponse)
-async def chat(req: ChatRequest):
+async def chat(
+    req: ChatRequest,
+    session: aiohttp.ClientSession = Depends(get_gemini_session),
+    cache: ResponseCache = Depends(get_cache),
+):
     api_key = os.getenv("GEMINI_API_KEY", "")
     if not api_key:
-        return ChatResponse(
-            reply="",
-            error="GEMINI_API_KEY not set in backend/.env — add it to enable the chatbot.",
-        )
-
-    contents = []
-    contents.append({"role": "user", "parts": [{"text": SYSTEM_PROMPT}]})
-    contents.append({"role": "model", "parts": [{"text": "Understood! I'm RoamIQ Travel Assistant, ready to help with all your travel questions. 🌍"}]})
-
-    for msg in req.history[-10:]:
-        role = "user" if msg.get("role") == "user" else "model"
-        contents.append({"role": role, "parts": [{"text": msg.get("content", "")}]})
+        return ChatResponse(reply="", error=_NO_KEY_ERROR)
 
-    contents.append({"role": "user", "parts": [{"text": req.message}]})
+    body, cache_key = _build_request(req)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        return ChatResponse(reply=cached)
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{GEMINI_URL}?key={api_key}",
-                json={
-                    "contents": contents,
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": 512,
-                        "topP": 0.9,
-                    },
-                },
-            )
-            data = resp.json()
-
-            if "candidates" in data and data["candidates"]:
-                text = data["candidates"][0]["content"]["parts"][0]["text"]
-                return ChatResponse(reply=text)
-            elif "error" in data:
-                return ChatResponse(reply="", error=data["error"].get("message", "Gemini API error"))
-            else:
-                return ChatResponse(reply="", error="No response from Gemini")
+        async with session.post(f"{GEMINI_URL}?key={api_key}", data=body, headers=_JSON_HEADERS) as resp:
+            data = orjson.loads(await resp.read())
+
+        candidates = data.get("candidates")
+        if candidates:
+            text = candidates[0]["content"]["parts"][0]["text"]
+            await cache.set(cache_key, text, CHAT_CACHE_TTL, stale=False)
+            return ChatResponse(reply=text)
+        err = data.get("error")
+        if err:
+            return ChatResponse(reply="", error=err.get("message", "Gemini API error"))
+        return ChatResponse(reply="", error="No response from Gemini")
     except Exception as e:
         return ChatResponse(reply="", error=str(e))
+
+
+@router.post("/stream")
+async def chat_stream(
+    req: ChatRequest,
+    session: aiohttp.ClientSession = Depends(get_gemini_session),
+    cache: ResponseCache = Depends(get_cache),
+):
+    """
+    Same as POST /api/chat/ but proxies Gemini's streamGenerateContent as
+    Server-Sent Events, so the first words show up as soon as they are generated.
+    Events: data: {"text": "..."} chunks, data: {"error": "..."} on failure,
+    and a final data: [DONE].
+    """
+    api_key = os.getenv("GEMINI_API_KEY", "")
+    body, cache_key = _build_request(req)
+
+    async def events():
+        if not api_key:
+            yield _sse({"error": _NO_KEY_ERROR})
+            return
+
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            yield _sse({"text": cached})
+            yield b"data: [DONE]\n\n"
+            return
+
+        parts: list[str] = []
+        try:
+            async with session.post(
+                f"{GEMINI_STREAM_URL}?alt=sse&key={api_key}", data=body, headers=_JSON_HEADERS
+            ) as resp:
+                if resp.status != 200:
+                    data = orjson.loads(await resp.read())
+                    if isinstance(data, list):
+                        data = data[0] if data else {}
+                    yield _sse({"error": data.get("error", {}).get("message", "Gemini API error")})
+                    return
+
+                async for line in resp.content:
+                    if not line.startswith(b"data:"):
+                        continue
+                    candidates = orjson.loads(line[5:]).get("candidates")
+                    if not candidates:
+                        continue
+                    text = "".join(
+                        p.get("text", "") for p in candidates[0].get("content", {}).get("parts", [])
+                    )
+                    if text:
+                        parts.append(text)
+                        yield _sse({"text": text})
+        except Exception as e:
+            yield _sse({"error": str(e)})
+            return
+
+        if not parts:
+            yield _sse({"error": "No response from Gemini"})
+            return
+        await cache.set(cache_key, "".join(parts), CHAT_CACHE_TTL, stale=False)
+        yield b"data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -5,13 +5,16 @@ Provides kid-friendly scoring and itinerary optimization for family travelers.
 
 import logging
 from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional
 
 from services.child_scorer import (
     score_activity_for_child,
-    rank_activities_for_children,
+    rank_activities_for_children_batch,
     get_kid_suggestions,
+    ChildBatch,
     ChildScore,
 )
 
@@ -19,6 +22,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/child", tags=["Child Mode"])
 
+# Serializes the whole scored list in one pydantic-core call
+_scored_adapter = TypeAdapter(list[ChildScore])
+
 
 # ── Request / Response Models ─────────────────────────────────
 class ChildActivity(BaseModel):
@@ -43,23 +49,32 @@ async def optimize_itinerary_for_children(req: ChildOptimizeRequest):
     Analyze and optimize an itinerary for children.
     Returns scored activities + fun suggestions.
     """
-    enriched = []
-    for activity in req.activities:
-        enriched.append({
-            "name": activity.title,
-            "description": activity.description,
-            "is_outdoor": activity.is_outdoor,
-            "duration_minutes": activity.duration_minutes,
-            "type": activity.category,
-        })
-
-    scored = rank_activities_for_children(enriched)
+    acts = req.activities
+    batch = ChildBatch.from_columns(
+        name=[a.title for a in acts],
+        description=[a.description for a in acts],
+        is_outdoor=[a.is_outdoor for a in acts],
+        duration_minutes=[a.duration_minutes for a in acts],
+        venue_type=[a.category for a in acts],
+    )
+
+    # Scoring is pure CPU work — keep it off the event loop for big itineraries
+    scored = await run_in_threadpool(rank_activities_for_children_batch, batch)
+
+    # Bucket activities and total the scores in a single pass
+    boring, okay, fun = [], [], []
+    total = 0.0
+    for s in scored:
+        total += s.overall_score
+        if s.overall_score < 40:
+            boring.append(s)
+        elif s.overall_score < 55:
+            okay.append(s)
+        elif s.overall_score >= 70:
+            fun.append(s)
 
     # Generate suggestions
     suggestions = []
-    boring = [s for s in scored if s.overall_score < 40]
-    okay = [s for s in scored if 40 <= s.overall_score < 55]
-    fun = [s for s in scored if s.overall_score >= 70]
 
     if fun:
         suggestions.append(
@@ -83,19 +98,17 @@ async def optimize_itinerary_for_children(req: ChildOptimizeRequest):
     suggestions.append("🧴 Pack sunscreen, hats, and water for outdoor activities.")
     suggestions.append("📱 Download offline games and movies for travel segments.")
 
-    overall_score = round(
-        sum(s.overall_score for s in scored) / len(scored), 1
-    ) if scored else 0
+    overall_score = round(total / len(scored), 1) if scored else 0
 
     # Get destination-specific kid activity suggestions
     kid_suggestions = get_kid_suggestions(req.destination)
 
     logger.info(f"Child optimization complete: {len(scored)} activities, overall={overall_score}")
 
-    return {
+    return ORJSONResponse({
         "destination": req.destination,
-        "scored_activities": [s.model_dump() for s in scored],
+        "scored_activities": _scored_adapter.dump_python(scored),
         "suggestions": suggestions,
         "overall_child_score": overall_score,
         "kid_activity_suggestions": kid_suggestions,
-    }
+    })
@@ -3,12 +3,19 @@ Crowd / traffic endpoints powered by BestTime API.
 Falls back to predicted crowd data when API data is unavailable.
 """
 
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, Query, Depends
-from pydantic import BaseModel
+from functools import cached_property
+from bisect import bisect_left
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, computed_field
 from typing import Optional
 
+from services.besttime import BestTimeClient
+from services.cache import ResponseCache
 from services.crowd_predictor import predict_busyness, classify_venue
+from services.forecast_utils import extract_venues_from_progress, extract_busyness_from_venue, parse_hour
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +23,53 @@ router = APIRouter(prefix="/api/crowd", tags=["Crowd & Traffic"])
 
 
 # ── Dependency to get BestTime client ─────────────────────────
-def get_besttime():
-    from main import besttime_client
-    return besttime_client
+def get_besttime(request: Request) -> BestTimeClient:
+    return request.app.state.besttime
+
+
+def get_cache(request: Request) -> ResponseCache:
+    return request.app.state.cache
+
+
+# ── Cache TTLs (seconds) ──────────────────────────────────────
+LIVE_TTL = 60
+FORECAST_TTL = 24 * 3600
+BEST_TIMES_TTL = 7 * 24 * 3600
+VENUE_SEARCH_TTL = 24 * 3600
+
+BESTTIME_CONCURRENCY = 10  # max parallel BestTime calls per itinerary analysis
+
+# Crowd tips by busyness band: <=30, <=60, <=80, >80
+_TIP_THRESHOLDS = (30, 60, 80)
+_TIPS = (
+    "✅ Great time to visit — minimal crowds!",
+    "🟢 Reasonable crowd levels.",
+    "🟡 Moderately busy. Plan extra time for queues.",
+    "🔴 Very crowded at this time! Consider visiting earlier or later.",
+)
+
+
+def _search_finished(data) -> bool:
+    """Only cache venue searches whose BestTime job actually completed."""
+    return isinstance(data, dict) and bool(data.get("job_finished"))
+
+
+# Concurrent identical searches are deduplicated inside BestTimeClient
+async def cached_venue_search(bt, cache: ResponseCache, query: str, num: int):
+    return await cache.fetch(
+        f"vs:{num}:{query.strip().lower()}",
+        VENUE_SEARCH_TTL,
+        lambda: bt.venue_search(query, num),
+        cacheable=_search_finished,
+    )
+
+
+async def cached_forecast_day(bt, cache: ResponseCache, venue_id: str, day: int):
+    return await cache.fetch(
+        f"ft:{venue_id}:{day}",
+        FORECAST_TTL,
+        lambda: bt.get_forecast_day(venue_id, day),
+    )
 
 
 # ── Request / Response Models ─────────────────────────────────
@@ -33,84 +84,26 @@ class ItineraryActivity(BaseModel):
     start_time: Optional[str] = None
     day_of_week: Optional[int] = None  # 0=Mon..6=Sun
 
+    # Parsed once per request; None when start_time is missing or malformed
+    @computed_field
+    @cached_property
+    def start_hour(self) -> Optional[int]:
+        return parse_hour(self.start_time)
+
 
 class AnalyzeItineraryRequest(BaseModel):
     destination: str
     activities: list[ItineraryActivity]
 
 
-# ── Helper: extract venues from BestTime progress response ────
-def extract_venues_from_progress(data) -> list[dict]:
-    """
-    BestTime venue_search returns progress data. Venues may be found
-    in 'venues' (raw format), 'venues_forecasts', or nested under
-    'venue_info' in individual items.
-    Handles both dict and list responses from the API.
-    """
-    # If data is already a list of venues, return it directly
-    if isinstance(data, list):
-        return data
-
-    # If data is not a dict, return empty
-    if not isinstance(data, dict):
-        return []
-
-    # Direct venues list (raw format from progress endpoint)
-    venues = data.get("venues", [])
-    if venues:
-        return venues if isinstance(venues, list) else []
-
-    # Venue forecasts list
-    forecasts = data.get("venues_forecasts", [])
-    if forecasts:
-        return forecasts if isinstance(forecasts, list) else []
-
-    # Try 'venue_info' wrapper
-    venue_info = data.get("venue_info", [])
-    if venue_info:
-        return venue_info if isinstance(venue_info, list) else []
-
-    return []
-
-
-# ── Helper: extract busyness from venue data ──────────────────
-def extract_busyness_from_venue(venue: dict, day_of_week: Optional[int] = None, hour: Optional[int] = None) -> Optional[float]:
-    """Try multiple paths to extract busyness from a venue dict."""
-    # Try venue_foot_traffic_forecast first
-    ft = venue.get("venue_foot_traffic_forecast") or venue.get("forecast") or {}
-    analysis = ft.get("analysis", {})
-
-    # Try to get specific day+hour data
-    if day_of_week is not None:
-        day_raw = analysis.get("day_raw", [])
-        if day_raw and hour is not None and 0 <= hour < len(day_raw):
-            val = day_raw[hour]
-            if isinstance(val, (int, float)) and val >= 0:
-                return float(val)
-
-    # Try week_raw for average
-    week_raw = analysis.get("week_raw", [])
-    if week_raw:
-        all_hours = []
-        for day in week_raw:
-            if isinstance(day, list):
-                all_hours.extend([h for h in day if isinstance(h, (int, float)) and h > 0])
-        if all_hours:
-            return round(sum(all_hours) / len(all_hours), 1)
-
-    # Try direct busyness fields
-    for key in ["venue_forecasted_busyness", "busyness", "busy_pct"]:
-        val = venue.get(key)
-        if isinstance(val, (int, float)):
-            return float(val)
-
-    return None
-
-
 # ── Endpoints ─────────────────────────────────────────────────
 
 @router.post("/venue-search")
-async def venue_search(req: VenueSearchRequest, bt=Depends(get_besttime)):
+async def venue_search(
+    req: VenueSearchRequest,
+    bt=Depends(get_besttime),
+    cache: ResponseCache = Depends(get_cache),
+):
     """Search venues by name/area and get foot-traffic data."""
     if not bt or not bt.is_configured:
         raise HTTPException(
@@ -118,7 +111,7 @@ async def venue_search(req: VenueSearchRequest, bt=Depends(get_besttime)):
             detail="BestTime API keys are not configured. Set BESTTIME_API_KEY_PRIVATE and BESTTIME_API_KEY_PUBLIC in your .env file.",
         )
     try:
-        data = await bt.venue_search(req.query, req.num)
+        data = await cached_venue_search(bt, cache, req.query, req.num)
         return data
     except Exception as e:
         logger.error(f"BestTime venue_search failed for query='{req.query}': {e}")
@@ -130,15 +123,18 @@ async def get_forecast(
     venue_id: str,
     day: Optional[int] = Query(None, ge=0, le=6, description="0=Mon..6=Sun"),
     bt=Depends(get_besttime),
+    cache: ResponseCache = Depends(get_cache),
 ):
     """Get crowd forecast for a venue."""
     if not bt or not bt.is_configured:
         raise HTTPException(status_code=503, detail="BestTime API keys not configured.")
     try:
         if day is not None:
-            data = await bt.get_forecast_day(venue_id, day)
+            data = await cached_forecast_day(bt, cache, venue_id, day)
         else:
-            data = await bt.get_forecast_week(venue_id)
+            data = await cache.fetch(
+                f"fw:{venue_id}", FORECAST_TTL, lambda: bt.get_forecast_week(venue_id)
+            )
         return data
     except Exception as e:
         logger.error(f"BestTime forecast failed for venue_id='{venue_id}': {e}")
@@ -146,12 +142,17 @@ async def get_forecast(
 
 
 @router.get("/live/{venue_id}")
-async def get_live_busyness(venue_id: str, bt=Depends(get_besttime)):
+async def get_live_busyness(
+    venue_id: str,
+    bt=Depends(get_besttime),
+    cache: ResponseCache = Depends(get_cache),
+):
     """Get current live busyness percentage for a venue."""
     if not bt or not bt.is_configured:
         raise HTTPException(status_code=503, detail="BestTime API keys not configured.")
     try:
-        data = await bt.get_live(venue_id)
+        # Live busyness is worthless once old — never served stale
+        data = await cache.fetch(f"live:{venue_id}", LIVE_TTL, lambda: bt.get_live(venue_id), stale=False)
         return data
     except Exception as e:
         logger.error(f"BestTime live failed for venue_id='{venue_id}': {e}")
@@ -159,20 +160,124 @@ async def get_live_busyness(venue_id: str, bt=Depends(get_besttime)):
 
 
 @router.get("/best-times/{venue_id}")
-async def get_best_times(venue_id: str, bt=Depends(get_besttime)):
+async def get_best_times(
+    venue_id: str,
+    bt=Depends(get_besttime),
+    cache: ResponseCache = Depends(get_cache),
+):
     """Get the quietest and busiest times for a venue."""
     if not bt or not bt.is_configured:
         raise HTTPException(status_code=503, detail="BestTime API keys not configured.")
     try:
-        data = await bt.get_best_times(venue_id)
+        data = await cache.fetch(
+            f"best:{venue_id}", BEST_TIMES_TTL, lambda: bt.get_best_times(venue_id)
+        )
         return data
     except Exception as e:
         logger.error(f"BestTime best_times failed for venue_id='{venue_id}': {e}")
         raise HTTPException(status_code=502, detail=f"BestTime API error: {str(e)}")
 
 
+def _fallback(activity: ItineraryActivity, hour: Optional[int]) -> dict:
+    """Predicted crowd result for an activity BestTime couldn't answer for."""
+    pred_pct, pred_tip, venue_type = predict_busyness(
+        activity.title, activity.location, hour, activity.day_of_week
+    )
+    return {
+        "activity": activity.title,
+        "venue_name": None,
+        "venue_id": None,
+        "busyness_at_planned_time": pred_pct,
+        "optimization_tip": pred_tip,
+        "venue_info": {"type": venue_type},
+        "is_predicted": True,
+    }
+
+
+async def _analyze_one(
+    activity: ItineraryActivity,
+    destination: str,
+    sem: asyncio.Semaphore,
+    bt,
+    cache: ResponseCache,
+) -> dict:
+    """Crowd analysis for a single activity — BestTime data with prediction fallback."""
+    search_query = f"{activity.title} in {destination}"
+    if activity.location:
+        search_query = f"{activity.title} {activity.location}"
+
+    hour = activity.start_hour
+
+    try:
+        logger.info(f"Searching BestTime for: '{search_query}'")
+        async with sem:
+            search_data = await cached_venue_search(bt, cache, search_query, 1)
+        venues = extract_venues_from_progress(search_data)
+
+        if not venues:
+            logger.info(f"No venues found for: '{search_query}' — using prediction")
+            # Fallback to predicted data
+            return _fallback(activity, hour)
+
+        venue = venues[0]
+        venue_id = venue.get("venue_id") if isinstance(venue, dict) else None
+        venue_name = (venue.get("venue_name", "Unknown") if isinstance(venue, dict) else "Unknown")
+        logger.info(f"Found venue: '{venue_name}' (id={venue_id})")
+
+        busyness_at_time = extract_busyness_from_venue(
+            venue, activity.day_of_week, hour
+        )
+
+        # If no busyness yet, try fetching forecast separately
+        if busyness_at_time is None and venue_id and activity.day_of_week is not None:
+            try:
+                async with sem:
+                    forecast = await cached_forecast_day(bt, cache, venue_id, activity.day_of_week)
+                if isinstance(forecast, dict):
+                    day_raw = forecast.get("analysis", {}).get("day_raw", [])
+                    if day_raw and hour is not None and 0 <= hour < len(day_raw):
+                        busyness_at_time = day_raw[hour]
+                        logger.info(f"Busyness at hour {hour}: {busyness_at_time}%")
+            except Exception as fe:
+                logger.warning(f"Forecast fetch failed for venue={venue_id}: {fe}")
+
+        # If still no busyness from API, use prediction
+        is_predicted = False
+        if busyness_at_time is not None:
+            tip = _TIPS[bisect_left(_TIP_THRESHOLDS, busyness_at_time)]
+        else:
+            # Use prediction as fallback
+            pred_pct, pred_tip, _ = predict_busyness(
+                activity.title, activity.location, hour, activity.day_of_week
+            )
+            busyness_at_time = pred_pct
+            tip = pred_tip
+            is_predicted = True
+
+        return {
+            "activity": activity.title,
+            "venue_name": venue_name,
+            "venue_id": venue_id,
+            "busyness_at_planned_time": busyness_at_time,
+            "optimization_tip": tip,
+            "venue_info": {
+                "address": venue.get("venue_address") if isinstance(venue, dict) else None,
+                "type": venue.get("venue_type") if isinstance(venue, dict) else None,
+            },
+            "is_predicted": is_predicted,
+        }
+    except Exception as e:
+        logger.error(f"BestTime analysis failed for '{activity.title}': {e}")
+        # Even on error, provide predicted data
+        return _fallback(activity, hour)
+
+
 @router.post("/analyze-itinerary")
-async def analyze_itinerary(req: AnalyzeItineraryRequest, bt=Depends(get_besttime)):
+async def analyze_itinerary(
+    req: AnalyzeItineraryRequest,
+    bt=Depends(get_besttime),
+    cache: ResponseCache = Depends(get_cache),
+):
     """
     Analyze crowd levels for each activity in an itinerary.
     Searches for each venue and returns busyness data + optimization tips.
@@ -182,137 +287,29 @@ async def analyze_itinerary(req: AnalyzeItineraryRequest, bt=Depends(get_besttim
 
     if not api_available:
         logger.warning("BestTime API not configured — returning fallback crowd data")
-
-    results = []
-    for activity in req.activities:
-        if not api_available:
+        results = []
+        for activity in req.activities:
             # Use prediction when API is not available
-            hour = None
-            if activity.start_time:
-                try:
-                    hour = int(activity.start_time.split(":")[0])
-                except (ValueError, IndexError):
-                    pass
-            pred_pct, pred_tip, venue_type = predict_busyness(
-                activity.title, activity.location, hour, activity.day_of_week
-            )
-            results.append({
-                "activity": activity.title,
-                "venue_name": None,
-                "venue_id": None,
-                "busyness_at_planned_time": pred_pct,
-                "optimization_tip": pred_tip,
-                "venue_info": {"type": venue_type},
-                "api_available": False,
-                "is_predicted": True,
-            })
-            continue
-
-        search_query = f"{activity.title} in {req.destination}"
-        if activity.location:
-            search_query = f"{activity.title} {activity.location}"
-
-        # Parse hour from start_time
-        hour = None
-        if activity.start_time:
-            try:
-                hour = int(activity.start_time.split(":")[0])
-            except (ValueError, IndexError):
-                pass
-
-        try:
-            logger.info(f"Searching BestTime for: '{search_query}'")
-            search_data = await bt.venue_search(search_query, num=1)
-            venues = extract_venues_from_progress(search_data)
-
-            if not venues:
-                logger.info(f"No venues found for: '{search_query}' — using prediction")
-                # Fallback to predicted data
-                pred_pct, pred_tip, venue_type = predict_busyness(
-                    activity.title, activity.location, hour, activity.day_of_week
-                )
-                results.append({
-                    "activity": activity.title,
-                    "venue_name": None,
-                    "venue_id": None,
-                    "busyness_at_planned_time": pred_pct,
-                    "optimization_tip": pred_tip,
-                    "venue_info": {"type": venue_type},
-                    "is_predicted": True,
-                })
-                continue
-
-            venue = venues[0]
-            venue_id = venue.get("venue_id") if isinstance(venue, dict) else None
-            venue_name = (venue.get("venue_name", "Unknown") if isinstance(venue, dict) else "Unknown")
-            logger.info(f"Found venue: '{venue_name}' (id={venue_id})")
-
-            busyness_at_time = extract_busyness_from_venue(
-                venue, activity.day_of_week, hour
-            )
-
-            # If no busyness yet, try fetching forecast separately
-            if busyness_at_time is None and venue_id and activity.day_of_week is not None:
-                try:
-                    forecast = await bt.get_forecast_day(venue_id, activity.day_of_week)
-                    if isinstance(forecast, dict):
-                        day_raw = forecast.get("analysis", {}).get("day_raw", [])
-                        if day_raw and hour is not None and 0 <= hour < len(day_raw):
-                            busyness_at_time = day_raw[hour]
-                            logger.info(f"Busyness at hour {hour}: {busyness_at_time}%")
-                except Exception as fe:
-                    logger.warning(f"Forecast fetch failed for venue={venue_id}: {fe}")
-
-            # If still no busyness from API, use prediction
-            is_predicted = False
-            if busyness_at_time is not None:
-                if busyness_at_time > 80:
-                    tip = "🔴 Very crowded at this time! Consider visiting earlier or later."
-                elif busyness_at_time > 60:
-                    tip = "🟡 Moderately busy. Plan extra time for queues."
-                elif busyness_at_time > 30:
-                    tip = "🟢 Reasonable crowd levels."
-                else:
-                    tip = "✅ Great time to visit — minimal crowds!"
-            else:
-                # Use prediction as fallback
-                pred_pct, pred_tip, _ = predict_busyness(
-                    activity.title, activity.location, hour, activity.day_of_week
-                )
-                busyness_at_time = pred_pct
-                tip = pred_tip
-                is_predicted = True
-
-            results.append({
-                "activity": activity.title,
-                "venue_name": venue_name,
-                "venue_id": venue_id,
-                "busyness_at_planned_time": busyness_at_time,
-                "optimization_tip": tip,
-                "venue_info": {
-                    "address": venue.get("venue_address") if isinstance(venue, dict) else None,
-                    "type": venue.get("venue_type") if isinstance(venue, dict) else None,
-                },
-                "is_predicted": is_predicted,
-            })
-        except Exception as e:
-            logger.error(f"BestTime analysis failed for '{activity.title}': {e}")
-            # Even on error, provide predicted data
-            pred_pct, pred_tip, venue_type = predict_busyness(
-                activity.title, activity.location, hour, activity.day_of_week
-            )
-            results.append({
-                "activity": activity.title,
-                "venue_name": None,
-                "venue_id": None,
-                "busyness_at_planned_time": pred_pct,
-                "optimization_tip": pred_tip,
-                "venue_info": {"type": venue_type},
-                "is_predicted": True,
-            })
-
-    return {
+            result = _fallback(activity, activity.start_hour)
+            result["api_available"] = False
+            results.append(result)
+    else:
+        # Look up all activities concurrently, capped to respect BestTime rate limits
+        sem = asyncio.Semaphore(BESTTIME_CONCURRENCY)
+        results = await asyncio.gather(
+            *[_analyze_one(a, req.destination, sem, bt, cache) for a in req.activities],
+            return_exceptions=True,
+        )
+        for i, outcome in enumerate(results):
+            if isinstance(outcome, Exception):
+                activity = req.activities[i]
+                logger.error(f"Crowd analysis task failed for '{activity.title}': {outcome}")
+                results[i] = _fallback(activity, activity.start_hour)
+
+    # Plain dicts all the way down — serialize once with orjson and skip
+    # FastAPI's jsonable_encoder walk over the results
+    return ORJSONResponse({
         "destination": req.destination,
         "analysis": results,
-        "api_configured": api_available,
-    }
+        "api_configured": bool(api_available),
+    })
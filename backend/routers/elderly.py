@@ -3,30 +3,31 @@ Elderly-friendly mode endpoints.
 Provides suggestions and itinerary optimization for elderly travelers.
 """
 
+import asyncio
 import logging
+from functools import cached_property
+import numpy as np
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, computed_field
 from typing import Optional
 
 from services.elderly_scorer import (
     score_venue_for_elderly,
-    rank_activities_for_elderly,
-    estimate_distance_from_duration,
-    estimate_steps_from_duration,
+    rank_activities_for_elderly_batch,
+    ElderlyBatch,
     VenueScore,
 )
 from services.crowd_predictor import predict_busyness
-from routers.crowd import extract_venues_from_progress
+from services.forecast_kernels import weekly_means
+from services.forecast_utils import parse_hour, week_avg
+from routers.crowd import extract_venues_from_progress, get_besttime, BESTTIME_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/elderly", tags=["Elderly Mode"])
 
-
-# ── Dependency to get BestTime client ─────────────────────────
-def get_besttime():
-    from main import besttime_client
-    return besttime_client
+# Dumps a whole list of scores in one pydantic-core call
+_scored_adapter = TypeAdapter(list[VenueScore])
 
 
 # ── Request / Response Models ─────────────────────────────────
@@ -40,6 +41,12 @@ class ElderlyActivity(BaseModel):
     day_of_week: Optional[int] = None  # 0=Mon..6=Sun
     start_time: Optional[str] = None
 
+    # Parsed once per request; None when start_time is missing or malformed
+    @computed_field
+    @cached_property
+    def start_hour(self) -> Optional[int]:
+        return parse_hour(self.start_time)
+
 
 class ElderlyOptimizeRequest(BaseModel):
     destination: str
@@ -71,43 +78,118 @@ async def get_elderly_suggestions(req: ElderlySearchRequest, bt=Depends(get_best
     # Default to elderly-friendly venue types
     search_types = req.types or ["museum", "cafe", "restaurant", "temple", "garden", "gallery"]
 
-    all_venues = []
-    for venue_type in search_types:
-        query = f"{venue_type} in {req.destination}"
-        try:
+    # Each search polls BestTime for up to 30s — run them all at once
+    sem = asyncio.Semaphore(BESTTIME_CONCURRENCY)
+
+    async def search(query: str):
+        async with sem:
             logger.info(f"Searching elderly venues: '{query}'")
-            data = await bt.venue_search(query, num=3)
-            venues = extract_venues_from_progress(data)
-            for v in venues:
-                if not isinstance(v, dict):
-                    continue
-                busyness = None
-                forecast = v.get("venue_foot_traffic_forecast")
-                if forecast and isinstance(forecast, dict):
-                    analysis = forecast.get("analysis", {})
-                    week_raw = analysis.get("week_raw", [])
-                    if week_raw:
-                        all_hours = [h for day in week_raw if isinstance(day, list) for h in day if isinstance(h, (int, float)) and h > 0]
-                        busyness = sum(all_hours) / len(all_hours) if all_hours else None
-
-                all_venues.append({
-                    "name": v.get("venue_name", "Unknown"),
-                    "busyness_pct": busyness,
-                    "is_outdoor": False,
-                    "duration_minutes": 60,
-                    "type": venue_type,
-                    "description": v.get("venue_type", ""),
-                    "has_seating": True,
-                })
-        except Exception as e:
-            logger.error(f"BestTime venue search failed for '{query}': {e}")
+            return await bt.venue_search(query, num=3)
+
+    queries = [f"{venue_type} in {req.destination}" for venue_type in search_types]
+    results = await asyncio.gather(*[search(q) for q in queries], return_exceptions=True)
+
+    # Column lists (one entry per venue) — scored as arrays below
+    names: list[str] = []
+    types: list[str] = []
+    descriptions: list[str] = []
+    week_grids = []  # (venue index, week_raw)
+    for venue_type, query, data in zip(search_types, queries, results):
+        if isinstance(data, Exception):
+            logger.error(f"BestTime venue search failed for '{query}': {data}")
             continue
-
-    if not all_venues:
+        venues = extract_venues_from_progress(data)
+        for v in venues:
+            if not isinstance(v, dict):
+                continue
+            forecast = v.get("venue_foot_traffic_forecast")
+            if forecast and isinstance(forecast, dict):
+                analysis = forecast.get("analysis", {})
+                week_raw = analysis.get("week_raw", [])
+                if week_raw:
+                    week_grids.append((len(names), week_raw))
+
+            names.append(v.get("venue_name", "Unknown"))
+            types.append(venue_type)
+            descriptions.append(v.get("venue_type", ""))
+
+    if not names:
         raise HTTPException(status_code=404, detail="No venues found for the given destination")
 
-    scored = rank_activities_for_elderly(all_venues)
-    return scored[:req.num]
+    # Average every venue's week in one kernel call; odd-shaped grids fall back
+    busyness: list[Optional[float]] = [None] * len(names)
+    if week_grids:
+        means = weekly_means([grid for _, grid in week_grids])
+        for (i, grid), avg in zip(week_grids, means):
+            busyness[i] = avg if avg is not None else week_avg(grid)
+
+    scored = rank_activities_for_elderly_batch(ElderlyBatch.from_columns(
+        name=names,
+        busyness_pct=busyness,
+        is_outdoor=[False] * len(names),
+        duration_minutes=[60] * len(names),
+        venue_type=types,
+        description=descriptions,
+    ), top_k=req.num)
+    return scored
+
+
+async def _find_venue(
+    activity: ElderlyActivity,
+    destination: str,
+    sem: asyncio.Semaphore,
+    bt,
+) -> Optional[dict]:
+    """Top BestTime venue match for an activity, or None."""
+    if not (activity.location or activity.title):
+        return None
+    search_query = f"{activity.title} in {destination}"
+    if activity.location:
+        search_query = f"{activity.title} {activity.location}"
+
+    try:
+        logger.info(f"Elderly analysis — searching BestTime for: '{search_query}'")
+        async with sem:
+            data = await bt.venue_search(search_query, num=1)
+        venues = extract_venues_from_progress(data)
+        if venues and isinstance(venues[0], dict):
+            logger.info(f"Found venue: '{venues[0].get('venue_name')}' for '{activity.title}'")
+            return venues[0]
+    except Exception as e:
+        logger.error(f"BestTime failed for '{activity.title}': {e}")
+    return None
+
+
+async def _forecast_day(venue_id: str, day: int, sem: asyncio.Semaphore, bt) -> Optional[dict]:
+    try:
+        async with sem:
+            forecast = await bt.get_forecast_day(venue_id, day)
+        return forecast if isinstance(forecast, dict) else None
+    except Exception as fe:
+        logger.warning(f"Forecast fetch failed for venue={venue_id}, day={day}: {fe}")
+        return None
+
+
+def _activity_busyness(
+    activity: ElderlyActivity,
+    hour: Optional[int],
+    venue: Optional[dict],
+    forecast: Optional[dict],
+) -> Optional[float]:
+    """Busyness from the day forecast at the planned hour, else the venue's weekly average."""
+    if forecast is not None and hour is not None:
+        day_raw = forecast.get("analysis", {}).get("day_raw", [])
+        if day_raw and 0 <= hour < len(day_raw):
+            logger.info(f"Busyness for '{activity.title}' at hour {hour}: {day_raw[hour]}%")
+            return day_raw[hour]
+
+    # Fallback: weekly average
+    if venue is not None:
+        ft = venue.get("venue_foot_traffic_forecast") or {}
+        analysis = ft.get("analysis") if isinstance(ft, dict) else None
+        if isinstance(analysis, dict):
+            return week_avg(analysis.get("week_raw"))
+    return None
 
 
 @router.post("/optimize-itinerary")
@@ -121,119 +203,88 @@ async def optimize_itinerary(req: ElderlyOptimizeRequest, bt=Depends(get_besttim
     if not api_available:
         logger.warning("BestTime API not configured — using heuristic-only elderly scoring")
 
-    enriched_activities = []
-
-    for activity in req.activities:
-        busyness = None
-
-        # Try to get crowd data for the activity (only if API is available)
-        if api_available and (activity.location or activity.title):
-            search_query = f"{activity.title} in {req.destination}"
-            if activity.location:
-                search_query = f"{activity.title} {activity.location}"
-
-            try:
-                logger.info(f"Elderly analysis — searching BestTime for: '{search_query}'")
-                data = await bt.venue_search(search_query, num=1)
-                venues = extract_venues_from_progress(data)
-                if venues:
-                    venue = venues[0]
-                    if isinstance(venue, dict):
-                        venue_id = venue.get("venue_id")
-                        logger.info(f"Found venue: '{venue.get('venue_name')}' for '{activity.title}'")
-
-                        # Get busyness at planned time
-                        if venue_id and activity.day_of_week is not None:
-                            try:
-                                forecast = await bt.get_forecast_day(venue_id, activity.day_of_week)
-                                if isinstance(forecast, dict) and activity.start_time:
-                                    hour = int(activity.start_time.split(":")[0])
-                                    day_raw = forecast.get("analysis", {}).get("day_raw", [])
-                                    if day_raw and 0 <= hour < len(day_raw):
-                                        busyness = day_raw[hour]
-                                        logger.info(f"Busyness for '{activity.title}' at hour {hour}: {busyness}%")
-                            except Exception as fe:
-                                logger.warning(f"Forecast fetch failed for '{activity.title}': {fe}")
-
-                        # Fallback: weekly average
-                        if busyness is None:
-                            ft = venue.get("venue_foot_traffic_forecast", {}) or {}
-                            analysis = ft.get("analysis", {}) if isinstance(ft, dict) else {}
-                            week_raw = analysis.get("week_raw", [])
-                            if week_raw:
-                                all_hours = [h for day in week_raw if isinstance(day, list) for h in day if isinstance(h, (int, float)) and h > 0]
-                                busyness = sum(all_hours) / len(all_hours) if all_hours else None
-            except Exception as e:
-                logger.error(f"BestTime failed for '{activity.title}': {e}")
-
-        # Use crowd prediction as fallback if no busyness from API
-        if busyness is None:
-            hour = None
-            if activity.start_time:
-                try:
-                    hour = int(activity.start_time.split(":")[0])
-                except (ValueError, IndexError):
-                    pass
-            pred_pct, _, _ = predict_busyness(
-                activity.title, activity.location, hour, activity.day_of_week
-            )
-            busyness = pred_pct
-
-        # Compute estimated distance and steps from real activity data
-        dist_km = estimate_distance_from_duration(
-            activity.duration_minutes,
-            activity.is_outdoor,
-            activity.category,
+    acts = req.activities
+    hours = [a.start_hour for a in acts]
+    venues: list[Optional[dict]] = [None] * len(acts)
+    forecasts: list[Optional[dict]] = [None] * len(acts)
+
+    if api_available:
+        # Capped to respect BestTime rate limits
+        sem = asyncio.Semaphore(BESTTIME_CONCURRENCY)
+
+        # Phase 1: resolve every activity to a venue concurrently
+        venues = await asyncio.gather(*[_find_venue(a, req.destination, sem, bt) for a in acts])
+
+        # Phase 2: one day forecast per distinct (venue, day), shared by all
+        # activities that landed on the same venue
+        wanted: dict[tuple[str, int], list[int]] = {}
+        for i, (a, venue) in enumerate(zip(acts, venues)):
+            venue_id = venue.get("venue_id") if venue else None
+            if venue_id and a.day_of_week is not None and hours[i] is not None:
+                wanted.setdefault((venue_id, a.day_of_week), []).append(i)
+        results = await asyncio.gather(
+            *[_forecast_day(vid, day, sem, bt) for vid, day in wanted]
         )
-        steps = estimate_steps_from_duration(
-            activity.duration_minutes,
-            activity.is_outdoor,
-            activity.category,
-        )
-
-        enriched_activities.append({
-            "name": activity.title,
-            "busyness_pct": busyness,
-            "is_outdoor": activity.is_outdoor,
-            "duration_minutes": activity.duration_minutes,
-            "type": activity.category,
-            "description": activity.description,
-            "has_seating": True,
-            "distance_km": dist_km,
-            "estimated_steps": steps,
-        })
-
-    scored = rank_activities_for_elderly(enriched_activities)
+        for indices, forecast in zip(wanted.values(), results):
+            for i in indices:
+                forecasts[i] = forecast
+
+    # Phase 3: busyness per activity, with crowd prediction as the fallback
+    busyness: list[Optional[float]] = []
+    for a, hour, venue, forecast in zip(acts, hours, venues, forecasts):
+        value = _activity_busyness(a, hour, venue, forecast)
+        if value is None:
+            value, _, _ = predict_busyness(a.title, a.location, hour, a.day_of_week)
+        busyness.append(value)
+
+    # Distance and steps are estimated from duration/type inside the batch scorer
+    scored = rank_activities_for_elderly_batch(ElderlyBatch.from_columns(
+        name=[a.title for a in acts],
+        busyness_pct=busyness,
+        is_outdoor=[a.is_outdoor for a in acts],
+        duration_minutes=[a.duration_minutes for a in acts],
+        venue_type=[a.category for a in acts],
+        description=[a.description for a in acts],
+    ))
 
     # Generate overall recommendations
     suggestions = []
 
-    high_risk = [s for s in scored if s.overall_score < 40]
-    moderate_risk = [s for s in scored if 40 <= s.overall_score < 55]
+    # Bucket activity names in one pass over the scores
+    high_risk, moderate_risk, long_activities, high_walk = [], [], [], []
+    scores = []
+    for s in scored:
+        scores.append(s.overall_score)
+        if s.overall_score < 40:
+            high_risk.append(s.name)
+        elif s.overall_score < 55:
+            moderate_risk.append(s.name)
+        if any("Long duration" in r for r in s.reasons):
+            long_activities.append(s.name)
+        if s.walkability_score < 40:
+            high_walk.append(s.name)
 
     if high_risk:
         suggestions.append(
             f"⚠️ {len(high_risk)} activities may be challenging for elderly travelers: "
-            + ", ".join(s.name for s in high_risk)
+            + ", ".join(high_risk)
         )
 
     if moderate_risk:
         suggestions.append(
             f"🟡 {len(moderate_risk)} activities need some adjustments: "
-            + ", ".join(s.name for s in moderate_risk)
+            + ", ".join(moderate_risk)
         )
 
     # Contextual tips based on actual activity data
-    long_activities = [s for s in scored if any("Long duration" in r for r in s.reasons)]
     if long_activities:
         suggestions.append(
             f"⏰ {len(long_activities)} activities are long — schedule 15-30 min rest breaks."
         )
 
-    high_walk = [s for s in scored if s.walkability_score < 40]
     if high_walk:
         suggestions.append(
-            f"🚕 Consider taxi/auto for: " + ", ".join(s.name for s in high_walk)
+            f"🚕 Consider taxi/auto for: " + ", ".join(high_walk)
         )
 
     suggestions.append(
@@ -248,15 +299,13 @@ async def optimize_itinerary(req: ElderlyOptimizeRequest, bt=Depends(get_besttim
             "ℹ️ Scores are estimated without crowd data. Configure BestTime API for more accurate results."
         )
 
-    overall_score = round(
-        sum(s.overall_score for s in scored) / len(scored), 1
-    ) if scored else 0
+    overall_score = round(float(np.mean(scores)), 1) if scores else 0
 
     logger.info(f"Elderly optimization complete: {len(scored)} activities, overall score={overall_score}")
 
     return {
         "destination": req.destination,
-        "scored_activities": [s.model_dump() for s in scored],
+        "scored_activities": _scored_adapter.dump_python(scored),
         "suggestions": suggestions,
         "overall_elderly_score": overall_score,
         "api_configured": api_available,
@@ -3,12 +3,13 @@ Foursquare-powered venue discovery endpoints.
 Returns real hotel, restaurant, and attraction data from Foursquare Places API.
 """
 
+import asyncio
 import logging
 from fastapi import APIRouter
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
-from services.foursquare import search_places, resolve_categories, CATEGORY_MAP
+from services.foursquare import search_places, resolve_categories, CATEGORY_MAP_LOWER
 from services.route_venues import search_venues_along_route
 
 logger = logging.getLogger(__name__)
@@ -22,13 +23,15 @@ class NearbyRequest(BaseModel):
     query: Optional[str] = None             # Free-text search
     limit: int = 10
     radius: int = 10000                     # meters
+    lat: Optional[float] = None             # Destination coordinates, if known —
+    lng: Optional[float] = None             # skips geocoding the destination name
 
 
 class RouteVenuesRequest(BaseModel):
     source: str                              # Source city (e.g. "Chennai, India")
     destination: str                         # Destination city (e.g. "Kanyakumari, India")
     categories: Optional[list[str]] = None   # ["hotels", "restaurants"]
-    interval_km: float = 50.0               # Sample every N km
+    interval_km: float = Field(50.0, gt=0)  # Sample every N km
     limit_per_point: int = 3                # Venues per sample point
 
 
@@ -40,22 +43,38 @@ async def get_nearby_places(req: NearbyRequest):
     """
     requested_categories = req.categories or ["hotels", "restaurants", "attractions"]
 
-    all_results: dict[str, list[dict]] = {}
-
-    for cat_name in requested_categories:
-        cat_id = CATEGORY_MAP.get(cat_name.lower())
+    # dict.fromkeys drops repeated categories while keeping request order
+    resolved: list[tuple[str, str]] = []
+    for cat_name in dict.fromkeys(requested_categories):
+        cat_id = CATEGORY_MAP_LOWER.get(cat_name.lower())
         if not cat_id:
             logger.warning(f"Unknown category: {cat_name}")
             continue
+        resolved.append((cat_name, cat_id))
+
+    # Search all categories concurrently — latency is the slowest one, not the sum
+    results_list = await asyncio.gather(
+        *[
+            search_places(
+                query=req.query,
+                near=req.destination,
+                categories=cat_id,
+                limit=req.limit,
+                radius=req.radius,
+                sort="RELEVANCE",
+                near_lat=req.lat,
+                near_lng=req.lng,
+            )
+            for _, cat_id in resolved
+        ],
+        return_exceptions=True,
+    )
 
-        results = await search_places(
-            query=req.query,
-            near=req.destination,
-            categories=cat_id,
-            limit=req.limit,
-            radius=req.radius,
-            sort="RELEVANCE",
-        )
+    all_results: dict[str, list[dict]] = {}
+    for (cat_name, _), results in zip(resolved, results_list):
+        if isinstance(results, Exception):
+            logger.error(f"Foursquare '{cat_name}' search failed in '{req.destination}': {results}")
+            results = []
         all_results[cat_name] = results
         logger.info(f"Foursquare '{cat_name}' in '{req.destination}': {len(results)} results")
 
@@ -0,0 +1,109 @@
+"""
+In-process cache for Mapbox geocoding, POI and driving-route lookups.
+
+Source/destination/"near" strings repeat across requests, and each lookup
+is a 100–500 ms Mapbox round trip (up to ~1 s for a Directions route).
+Results are kept in an LRU+TTL cache keyed on the normalized place string,
+the rounded point + category for POI searches, or the rounded endpoints
+for routes. Concurrent misses for the same key share one request. The
+cache is written to GEO_CACHE_PATH on shutdown and reloaded on startup, so
+it survives restarts.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+GEO_CACHE_TTL = 24 * 3600
+GEO_CACHE_MAXSIZE = 1024
+GEO_CACHE_PATH = os.getenv("GEO_CACHE_PATH", "geo_cache.json")
+
+_cache = TTLCache(GEO_CACHE_TTL, maxsize=GEO_CACHE_MAXSIZE)
+# Lookups currently in progress, so concurrent misses await one request
+_inflight: dict[str, asyncio.Future] = {}
+
+
+def normalize(place: str) -> str:
+    """Cache-key form of a place string."""
+    return place.strip().lower()
+
+
+def point_key(lat: float, lng: float, search_query: str, limit: int) -> str:
+    """Cache key for a POI search around a point (~100 m grid)."""
+    return f"poi:{lat:.3f},{lng:.3f}:{search_query}:{limit}"
+
+
+def route_key(origin_lng: float, origin_lat: float, dest_lng: float, dest_lat: float) -> str:
+    """Cache key for a driving route between two points (~100 m grid)."""
+    return f"route:{origin_lng:.3f},{origin_lat:.3f};{dest_lng:.3f},{dest_lat:.3f}"
+
+
+def get(key: str) -> Optional[Any]:
+    """Cached value for key, or None if missing or expired."""
+    return _cache.get(key)
+
+
+def put(key: str, value: Any) -> None:
+    """Cache value under key, e.g. for results fetched in a batch request."""
+    _cache.set(key, value)
+
+
+async def cached(
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+    cacheable: Optional[Callable[[Any], bool]] = None,
+) -> Any:
+    """
+    Return the cached value for key, or await loader() once per key. The
+    result is cached unless it is None or cacheable(result) is False.
+    """
+    value = _cache.get(key)
+    if value is not None:
+        return value
+
+    fut = _inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(_load(key, loader, cacheable))
+        _inflight[key] = fut
+        fut.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller disconnecting must not cancel the lookup for the others
+    return await asyncio.shield(fut)
+
+
+async def _load(key: str, loader, cacheable) -> Any:
+    value = await loader()
+    if value is not None and (cacheable is None or cacheable(value)):
+        _cache.set(key, value)
+    return value
+
+
+def load(path: str = GEO_CACHE_PATH) -> None:
+    """Restore a cache written by save(); a missing or bad file is ignored."""
+    try:
+        with open(path, "rb") as f:
+            entries = orjson.loads(f.read())
+    except FileNotFoundError:
+        return
+    except Exception as e:
+        logger.warning(f"Could not read geo cache '{path}': {e}")
+        return
+    _cache.restore(entries)
+    logger.info(f"Geo cache: restored {len(_cache)} entries from '{path}'")
+
+
+def save(path: str = GEO_CACHE_PATH) -> None:
+    """Write unexpired entries to path (atomically, via a temp file)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(_cache.snapshot()))
+        os.replace(tmp, path)
+    except Exception as e:
+        logger.warning(f"Could not write geo cache '{path}': {e}")
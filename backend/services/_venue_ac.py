@@ -0,0 +1,65 @@
+"""
+Shared Aho-Corasick automaton for venue-type classification.
+
+The crowd predictor, child scorer and elderly scorer each keep their own
+keyword → venue-type table (a "scheme"). All schemes are merged into one
+automaton, so classifying a text is a single linear scan regardless of how
+many keywords exist. Each keyword carries a (tier, priority) rank per scheme;
+classify() returns the label of the lowest-ranked hit for the asked scheme.
+"""
+
+import threading
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+import ahocorasick
+
+_AC = ahocorasick.Automaton()
+# keyword -> {scheme: (tier, priority, label)}
+_ENTRIES: dict[str, dict[str, Tuple[int, int, Any]]] = {}
+_BEST_RANK: dict[str, Tuple[int, int]] = {}
+_dirty = False
+_lock = threading.Lock()
+
+
+def register(scheme: str, entries: Iterable[Tuple[str, int, int, Hashable]]) -> None:
+    """
+    Add (keyword, tier, priority, label) entries for a scheme. A keyword
+    registered twice in the same scheme keeps its lowest rank.
+    """
+    global _dirty
+    with _lock:
+        for keyword, tier, prio, label in entries:
+            per_scheme = _ENTRIES.setdefault(keyword, {})
+            current = per_scheme.get(scheme)
+            if current is None or (tier, prio) < current[:2]:
+                per_scheme[scheme] = (tier, prio, label)
+            best = _BEST_RANK.get(scheme)
+            if best is None or (tier, prio) < best:
+                _BEST_RANK[scheme] = (tier, prio)
+        _dirty = True
+
+
+def _ensure_built() -> None:
+    global _dirty
+    if not _dirty:
+        return
+    with _lock:
+        if _dirty:
+            for keyword, per_scheme in _ENTRIES.items():
+                _AC.add_word(keyword, per_scheme)
+            _AC.make_automaton()
+            _dirty = False
+
+
+def classify(text: str, scheme: str, default: Any = None) -> Any:
+    """Return the best-ranked label of scheme found in text (already lowercased)."""
+    _ensure_built()
+    best: Optional[Tuple[int, int, Any]] = None
+    floor = _BEST_RANK.get(scheme)
+    for _, per_scheme in _AC.iter(text):
+        match = per_scheme.get(scheme)
+        if match is not None and (best is None or match[:2] < best[:2]):
+            best = match
+            if match[:2] == floor:
+                break  # nothing in this scheme ranks higher
+    return best[2] if best else default
@@ -9,18 +9,47 @@ be polled via the progress endpoint until the job finishes.
 import asyncio
 import logging
 import httpx
+import orjson
 from typing import Optional
 
+from services.ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://besttime.app/api/v1"
 
+# Venue-search polling: short first delay, then exponential backoff
+POLL_INITIAL_DELAY = 0.4  # seconds
+POLL_BACKOFF = 1.6
+POLL_MAX_DELAY = 3.0
+POLL_TIMEOUT = 25.0
+
+# In-process caches — repeat searches skip the whole job/poll cycle
+SEARCH_CACHE_TTL = 15 * 60
+FORECAST_CACHE_TTL = 24 * 3600
+
 
 class BestTimeClient:
     def __init__(self, api_key_private: str, api_key_public: str):
         self.api_key_private = api_key_private
         self.api_key_public = api_key_public
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # One pooled client shared by all concurrent searches/polls. HTTP/2
+        # multiplexes the fanned-out polls over a few long-lived connections
+        # instead of a TLS handshake per request.
+        self.client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60.0,
+            ),
+        )
+        self._search_cache = TTLCache(SEARCH_CACHE_TTL, maxsize=512)
+        self._forecast_cache = TTLCache(FORECAST_CACHE_TTL, maxsize=2048)
+        # Lookups currently in progress — concurrent identical calls await the
+        # same future instead of starting another BestTime job (single-flight)
+        self._inflight: dict[tuple, asyncio.Future] = {}
 
     @property
     def is_configured(self) -> bool:
@@ -34,13 +63,43 @@ class BestTimeClient:
     async def close(self):
         await self.client.aclose()
 
+    async def _cached(self, cache: TTLCache, key: tuple, loader, cacheable=None):
+        """Return cache[key], or run loader() once per key and cache its result."""
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._load(cache, key, loader, cacheable))
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: one caller disconnecting must not cancel the lookup for the others
+        return await asyncio.shield(fut)
+
+    @staticmethod
+    async def _load(cache: TTLCache, key: tuple, loader, cacheable):
+        value = await loader()
+        if cacheable is None or cacheable(value):
+            cache.set(key, value)
+        return value
+
     # ── Venue Search (async with polling) ─────────────────────
     async def venue_search(self, query: str, num: int = 5) -> dict:
         """
         Search venues by name/area and get foot-traffic forecasts.
         BestTime runs this in the background, so we poll for completion.
         Returns the final progress response which includes venue data.
+        Finished searches are cached for SEARCH_CACHE_TTL.
         """
+        return await self._cached(
+            self._search_cache,
+            ("search", query, num),
+            lambda: self._venue_search(query, num),
+            cacheable=lambda data: isinstance(data, dict) and bool(data.get("job_finished")),
+        )
+
+    async def _venue_search(self, query: str, num: int) -> dict:
         logger.info(f"BestTime venue_search: q='{query}', num={num}")
 
         # Step 1: Start the search job
@@ -53,7 +112,12 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        start_data = resp.json()
+        start_data = orjson.loads(resp.content)
+
+        # Cached/small searches can come back already finished — skip polling
+        if start_data.get("job_finished") or start_data.get("venues"):
+            logger.info(f"BestTime search for '{query}' finished on the initial request")
+            return start_data
 
         job_id = start_data.get("job_id")
         collection_id = start_data.get("collection_id")
@@ -64,43 +128,65 @@ class BestTimeClient:
 
         logger.info(f"BestTime search job started: job_id={job_id}, collection_id={collection_id}")
 
-        # Step 2: Poll for progress until job_finished=True (max ~30s)
-        max_polls = 15
-        poll_interval = 2  # seconds
-        for i in range(max_polls):
-            await asyncio.sleep(poll_interval)
-            try:
-                progress_resp = await self.client.get(
-                    f"{BASE_URL}/venues/progress",
-                    params={
-                        "job_id": job_id,
-                        "collection_id": collection_id,
-                        "format": "raw",
-                    },
-                )
-                progress_resp.raise_for_status()
-                progress_data = progress_resp.json()
-
-                job_finished = progress_data.get("job_finished", False)
-                count_completed = progress_data.get("count_completed", 0)
-                count_total = progress_data.get("count_total", 0)
-
-                logger.info(
-                    f"Poll {i+1}/{max_polls}: finished={job_finished}, "
-                    f"completed={count_completed}/{count_total}"
-                )
-
-                if job_finished:
-                    # Return the progress response which includes venue data
-                    return progress_data
-
-            except Exception as e:
-                logger.warning(f"Poll {i+1} failed: {e}")
-                continue
-
-        logger.warning(f"venue_search timed out after {max_polls * poll_interval}s")
+        # Step 2: Poll for progress until job_finished=True (max POLL_TIMEOUT).
+        # Check once straight away (popular venues are often done already),
+        # then back off: short sleeps first, longer ones for big jobs.
+        progress_data: Optional[dict] = None
+
+        async def poll() -> dict:
+            nonlocal progress_data
+            delay = POLL_INITIAL_DELAY
+            i = 0
+            while True:
+                i += 1
+                try:
+                    progress_resp = await self.client.get(
+                        f"{BASE_URL}/venues/progress",
+                        params={
+                            "job_id": job_id,
+                            "collection_id": collection_id,
+                            "format": "raw",
+                        },
+                    )
+                    progress_resp.raise_for_status()
+                    progress_data = orjson.loads(progress_resp.content)
+
+                    job_finished = progress_data.get("job_finished", False)
+                    count_completed = progress_data.get("count_completed", 0)
+                    count_total = progress_data.get("count_total", 0)
+
+                    logger.info(
+                        f"Poll {i}: finished={job_finished}, "
+                        f"completed={count_completed}/{count_total}"
+                    )
+
+                    if job_finished or (count_total and count_completed >= count_total):
+                        # Return the progress response which includes venue data
+                        return progress_data
+
+                except httpx.HTTPStatusError as e:
+                    # 4xx (bad job/collection id, key) won't fix itself — give up
+                    status = e.response.status_code
+                    if status != 429 and status < 500:
+                        raise
+                    logger.warning(f"Poll {i} failed: {e}")
+                except (httpx.TransportError, orjson.JSONDecodeError) as e:
+                    logger.warning(f"Poll {i} failed: {e}")
+
+                # Only sleep when the job isn't done yet
+                await asyncio.sleep(delay)
+                delay = min(delay * POLL_BACKOFF, POLL_MAX_DELAY)
+
+        try:
+            # wait_for rather than asyncio.timeout — we still support Python 3.10
+            return await asyncio.wait_for(poll(), timeout=POLL_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning(f"venue_search timed out after {POLL_TIMEOUT:.0f}s")
+        except httpx.HTTPStatusError as e:
+            logger.warning(f"venue_search polling aborted: {e}")
+
         # Return whatever we have so far
-        return progress_data if 'progress_data' in dir() else start_data
+        return progress_data if progress_data is not None else start_data
 
     # ── New Forecast ──────────────────────────────────────────
     async def new_forecast(self, venue_name: str, venue_address: str) -> dict:
@@ -114,7 +200,7 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Get Forecast (week overview) ──────────────────────────
     async def get_forecast_week(self, venue_id: str) -> dict:
@@ -127,14 +213,22 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Get Forecast (specific day) ───────────────────────────
     async def get_forecast_day(self, venue_id: str, day_int: int) -> dict:
         """
         Get hourly forecast for a specific day.
         day_int: 0=Mon, 1=Tue, ..., 6=Sun
+        Cached for FORECAST_CACHE_TTL — weekly patterns rarely change.
         """
+        return await self._cached(
+            self._forecast_cache,
+            ("day", venue_id, day_int),
+            lambda: self._get_forecast_day(venue_id, day_int),
+        )
+
+    async def _get_forecast_day(self, venue_id: str, day_int: int) -> dict:
         resp = await self.client.get(
             f"{BASE_URL}/forecasts/daily",
             params={
@@ -144,7 +238,7 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Get Forecast (specific hour) ──────────────────────────
     async def get_forecast_hour(self, venue_id: str, day_int: int, hour: int) -> dict:
@@ -159,7 +253,7 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Live Busyness ─────────────────────────────────────────
     async def get_live(self, venue_id: str) -> dict:
@@ -172,7 +266,7 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Best Times (quiet/busy) ───────────────────────────────
     async def get_best_times(self, venue_id: str) -> dict:
@@ -185,7 +279,7 @@ class BestTimeClient:
             },
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
 
     # ── Venue Filter ──────────────────────────────────────────
     async def venue_filter(
@@ -218,4 +312,4 @@ class BestTimeClient:
             params=params,
         )
         resp.raise_for_status()
-        return resp.json()
+        return orjson.loads(resp.content)
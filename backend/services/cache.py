@@ -0,0 +1,108 @@
+"""
+Redis-backed response cache for upstream API calls (BestTime, Gemini).
+
+Caching is optional — when REDIS_URL is not set, every lookup goes straight
+to the loader. Each cached value also keeps a long-lived "stale" copy that is
+served when the upstream is down (5xx / timeout / connection error) instead of
+an error; dict values served that way carry "stale": True. Client errors (4xx,
+e.g. a revoked key or unknown venue) always propagate.
+
+Recommended Redis config: maxmemory-policy allkeys-lfu, so hot venues stay
+cached when memory runs out.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Optional
+
+import httpx
+import orjson
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+STALE_TTL = 30 * 24 * 3600  # keep last-known values around for a month
+
+
+def _is_outage(e: Exception) -> bool:
+    """True for upstream failures a stale copy may paper over (5xx, timeouts, network)."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return e.response.status_code >= 500
+    return isinstance(e, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError))
+
+
+class ResponseCache:
+    def __init__(self, url: Optional[str]):
+        self.redis = redis.from_url(url, decode_responses=True) if url else None
+        # Hit/miss counters per key namespace, e.g. {"chat_hit": 3, "chat_miss": 7}
+        self.stats: Counter[str] = Counter()
+
+    @property
+    def is_configured(self) -> bool:
+        return self.redis is not None
+
+    async def close(self):
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on miss / Redis error."""
+        if self.redis is None:
+            return None
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            logger.warning(f"Redis GET failed for '{key}': {e}")
+            return None
+        namespace = key.split(":", 1)[0]
+        self.stats[f"{namespace}_{'miss' if raw is None else 'hit'}"] += 1
+        return orjson.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any, ttl: int, stale: bool = True):
+        """Store value under key for ttl seconds, plus a long-lived stale copy."""
+        if self.redis is None:
+            return
+        raw = orjson.dumps(value)
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.setex(key, ttl, raw)
+                if stale:
+                    pipe.setex(f"stale:{key}", STALE_TTL, raw)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis SETEX failed for '{key}': {e}")
+
+    async def fetch(
+        self,
+        key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[Any]],
+        cacheable: Optional[Callable[[Any], bool]] = None,
+        stale: bool = True,
+    ) -> Any:
+        """
+        Return the cached value for key, or await loader() and cache its result.
+        If the upstream is down (see _is_outage) and a stale copy exists, that
+        copy is returned instead, marked "stale": True when it is a dict;
+        otherwise the exception propagates. stale=False keeps no stale copy,
+        for data that is meaningless once old (e.g. live busyness).
+        """
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            value = await loader()
+        except Exception as e:
+            if not stale or not _is_outage(e):
+                raise
+            old = await self.get(f"stale:{key}")
+            if old is None:
+                raise
+            logger.warning(f"Upstream failed for '{key}' ({e}) — serving stale cache")
+            return {**old, "stale": True} if isinstance(old, dict) else old
+
+        if cacheable is None or cacheable(value):
+            await self.set(key, value, ttl, stale=stale)
+        return value
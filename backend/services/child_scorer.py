@@ -11,13 +11,20 @@ Also suggests kid-friendly alternatives for adult-oriented activities.
 """
 
 import logging
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional, Tuple
-from pydantic import BaseModel
+
+import ahocorasick
+import numpy as np
+
+from services import _venue_ac
 
 logger = logging.getLogger(__name__)
 
 
-class ChildScore(BaseModel):
+@dataclass(slots=True)
+class ChildScore:
     name: str
     fun_score: float          # 0-100, higher = more fun for kids
     safety_score: float       # 0-100, higher = safer
@@ -30,12 +37,19 @@ class ChildScore(BaseModel):
 
 
 # ── Kid-friendly activity types ──────────────────────────────
-KID_FRIENDLY_TYPES = {
+KID_FRIENDLY_TYPES = frozenset({
     "amusement_park", "theme_park", "zoo", "aquarium", "playground",
     "park", "water_park", "waterpark", "beach", "ice_cream",
     "toy_store", "carnival", "circus", "bowling", "arcade",
     "trampoline", "museum", "science_center", "planetarium",
-}
+})
+
+# Venue-type groups used by the safety and engagement scores
+_SAFE_TYPES = frozenset({"restaurant", "hotel", "museum", "cinema", "mall"})
+_SUPERVISED_TYPES = frozenset({"beach", "waterfall", "viewpoint"})  # need supervision
+_ENGAGING_TYPES = frozenset({"zoo", "aquarium", "amusement_park", "theme_park", "playground", "museum"})
+_OPEN_PLAY_TYPES = frozenset({"park", "beach"})
+_QUIET_TYPES = frozenset({"temple", "monument"})  # might be boring
 
 # Activities kids especially love
 SUPER_FUN_KEYWORDS = [
@@ -62,6 +76,32 @@ RISKY_FOR_KIDS_KEYWORDS = [
     "skydiving", "zip line", "mountaineering",
 ]
 
+# ── Keyword automaton ─────────────────────────────────────────
+# One Aho–Corasick pass over the text finds every keyword from all three
+# lists at once. Each keyword maps to (bucket, index) so hits can be counted
+# once per distinct keyword, like `kw in text` did.
+_FUN, _BORING, _RISKY = 0, 1, 2
+
+_KEYWORD_AC = ahocorasick.Automaton()
+for _bucket, _keywords in (
+    (_FUN, SUPER_FUN_KEYWORDS),
+    (_BORING, BORING_FOR_KIDS_KEYWORDS),
+    (_RISKY, RISKY_FOR_KIDS_KEYWORDS),
+):
+    for _i, _kw in enumerate(_keywords):
+        _KEYWORD_AC.add_word(_kw, (_bucket, _i))
+_KEYWORD_AC.make_automaton()
+
+
+def _keyword_hits(text: str) -> list[int]:
+    """Number of distinct fun / boring / risky keywords found in text."""
+    found = {value for _, value in _KEYWORD_AC.iter(text)}
+    counts = [0, 0, 0]
+    for bucket, _ in found:
+        counts[bucket] += 1
+    return counts
+
+
 # Kid-friendly alternatives by activity type
 _ALTERNATIVES: dict[str, list[str]] = {
     "temple": [
@@ -113,31 +153,32 @@ _VENUE_EMOJIS: dict[str, str] = {
 }
 
 
-def _classify_for_kids(title: str, description: Optional[str] = None) -> str:
-    """Classify activity type for kid scoring."""
-    text = f"{title} {description or ''}".lower()
-    for venue_type in KID_FRIENDLY_TYPES:
-        if venue_type.replace("_", " ") in text or venue_type in text:
-            return venue_type
-
-    # Check broader patterns
-    patterns = [
-        ("beach", ["beach", "shore", "coast", "seaside"]),
-        ("temple", ["temple", "mandir", "church", "mosque", "shrine"]),
-        ("restaurant", ["restaurant", "cafe", "food", "breakfast", "lunch", "dinner", "dosa", "biryani"]),
-        ("station", ["railway", "station", "bus stand", "airport", "departure", "arrival"]),
-        ("hotel", ["hotel", "resort", "check-in", "lodge", "stay"]),
-        ("monument", ["fort", "palace", "memorial", "tomb"]),
-        ("park", ["park", "garden", "botanical"]),
-        ("market", ["market", "bazaar", "shopping", "mall"]),
-        ("viewpoint", ["viewpoint", "sunset", "sunrise", "scenic", "lookout"]),
-        ("waterfall", ["waterfall", "falls", "dam", "lake"]),
-    ]
-    for vtype, keywords in patterns:
-        for kw in keywords:
-            if kw in text:
-                return vtype
-    return "attraction"
+# Broader venue patterns, checked in priority order after KID_FRIENDLY_TYPES
+_KID_PATTERNS: list[Tuple[str, list[str]]] = [
+    ("beach", ["beach", "shore", "coast", "seaside"]),
+    ("temple", ["temple", "mandir", "church", "mosque", "shrine"]),
+    ("restaurant", ["restaurant", "cafe", "food", "breakfast", "lunch", "dinner", "dosa", "biryani"]),
+    ("station", ["railway", "station", "bus stand", "airport", "departure", "arrival"]),
+    ("hotel", ["hotel", "resort", "check-in", "lodge", "stay"]),
+    ("monument", ["fort", "palace", "memorial", "tomb"]),
+    ("park", ["park", "garden", "botanical"]),
+    ("market", ["market", "bazaar", "shopping", "mall"]),
+    ("viewpoint", ["viewpoint", "sunset", "sunrise", "scenic", "lookout"]),
+    ("waterfall", ["waterfall", "falls", "dam", "lake"]),
+]
+
+# A kid-friendly type (tier 0) always wins over a broader pattern (tier 1),
+# and within tier 1 the earlier pattern group wins.
+_venue_ac.register("kids", [
+    *((kw, 0, 0, vt) for vt in KID_FRIENDLY_TYPES for kw in {vt, vt.replace("_", " ")}),
+    *((kw, 1, prio, vt) for prio, (vt, keywords) in enumerate(_KID_PATTERNS) for kw in keywords),
+])
+
+
+@lru_cache(maxsize=4096)
+def _classify_for_kids(text_lower: str) -> str:
+    """Classify activity type for kid scoring from the lowercased "name description" text."""
+    return _venue_ac.classify(text_lower, "kids", "attraction")
 
 
 def score_activity_for_child(
@@ -149,14 +190,13 @@ def score_activity_for_child(
 ) -> ChildScore:
     """Score an activity for child-friendliness."""
     text = f"{name} {description or ''}".lower()
-    vtype = venue_type or _classify_for_kids(name, description)
+    vtype = venue_type or _classify_for_kids(text)
     emoji = _VENUE_EMOJIS.get(vtype, "⭐")
 
     # ── Fun Score ──
     fun = 50.0
-    super_fun_hits = sum(1 for kw in SUPER_FUN_KEYWORDS if kw in text)
+    super_fun_hits, boring_hits, risky_hits = _keyword_hits(text)
     fun += super_fun_hits * 12
-    boring_hits = sum(1 for kw in BORING_FOR_KIDS_KEYWORDS if kw in text)
     fun -= boring_hits * 15
 
     if vtype in KID_FRIENDLY_TYPES:
@@ -172,24 +212,23 @@ def score_activity_for_child(
 
     # ── Safety Score ──
     safety = 70.0
-    risky_hits = sum(1 for kw in RISKY_FOR_KIDS_KEYWORDS if kw in text)
     safety -= risky_hits * 20
     if not is_outdoor:
         safety += 10
-    if vtype in {"restaurant", "hotel", "museum", "cinema", "mall"}:
+    if vtype in _SAFE_TYPES:
         safety += 10
-    if vtype in {"beach", "waterfall", "viewpoint"}:
+    if vtype in _SUPERVISED_TYPES:
         safety -= 5  # need supervision
 
     safety = max(0, min(100, safety))
 
     # ── Engagement Score ──
     engagement = 50.0
-    if vtype in {"zoo", "aquarium", "amusement_park", "theme_park", "playground", "museum"}:
+    if vtype in _ENGAGING_TYPES:
         engagement += 30
-    elif vtype in {"park", "beach"}:
+    elif vtype in _OPEN_PLAY_TYPES:
         engagement += 15
-    elif vtype in {"temple", "monument"}:
+    elif vtype in _QUIET_TYPES:
         engagement -= 5  # might be boring
     if super_fun_hits > 0:
         engagement += 15
@@ -202,7 +241,30 @@ def score_activity_for_child(
     overall = (fun * 0.45) + (safety * 0.25) + (engagement * 0.30)
     overall = max(0, min(100, overall))
 
-    # ── Reasons ──
+    reasons = _reasons(fun, safety, risky_hits, is_outdoor, duration_minutes)
+    rec, emoji, alternative = _recommendation(overall, emoji, vtype, name)
+
+    return ChildScore(
+        name=name,
+        fun_score=round(fun, 1),
+        safety_score=round(safety, 1),
+        engagement_score=round(engagement, 1),
+        overall_score=round(overall, 1),
+        recommendation=rec,
+        emoji=emoji,
+        reasons=reasons,
+        suggested_alternative=alternative,
+    )
+
+
+def _reasons(
+    fun: float,
+    safety: float,
+    risky_hits: int,
+    is_outdoor: bool,
+    duration_minutes: Optional[int],
+) -> list[str]:
+    """Explanation bullets for a scored activity."""
     reasons = []
     if fun >= 70:
         reasons.append("🎉 Kids will love this activity!")
@@ -227,8 +289,11 @@ def score_activity_for_child(
 
     if is_outdoor:
         reasons.append("☀️ Outdoor — bring sunscreen, hats, and water")
+    return reasons
+
 
-    # ── Recommendation tier ──
+def _recommendation(overall: float, emoji: str, vtype: str, name: str) -> Tuple[str, str, Optional[str]]:
+    """Recommendation tier, display emoji and (for low scores) a kid-friendly alternative."""
     if overall >= 75:
         rec = "Super Fun!"
         emoji = "🌟"
@@ -247,33 +312,118 @@ def score_activity_for_child(
             "🎨 Look for interactive workshops or play areas nearby",
         ])
         alternative = alts[0] if alts else None
-
-    return ChildScore(
-        name=name,
-        fun_score=round(fun, 1),
-        safety_score=round(safety, 1),
-        engagement_score=round(engagement, 1),
-        overall_score=round(overall, 1),
-        recommendation=rec,
-        emoji=emoji,
-        reasons=reasons,
-        suggested_alternative=alternative,
-    )
+    return rec, emoji, alternative
 
 
 def rank_activities_for_children(activities: list[dict]) -> list[ChildScore]:
     """Score and rank activities for child suitability."""
-    scored = [
-        score_activity_for_child(
-            name=a.get("name") or a.get("title", "Unknown"),
-            description=a.get("description"),
-            is_outdoor=a.get("is_outdoor", False),
-            duration_minutes=a.get("duration_minutes"),
-            venue_type=a.get("type") or a.get("category"),
+    return rank_activities_for_children_batch(ChildBatch.from_columns(
+        name=[a.get("name") or a.get("title", "Unknown") for a in activities],
+        description=[a.get("description") for a in activities],
+        is_outdoor=[a.get("is_outdoor", False) for a in activities],
+        duration_minutes=[a.get("duration_minutes") for a in activities],
+        venue_type=[a.get("type") or a.get("category") for a in activities],
+    ))
+
+
+# ── Batch (column-oriented) scoring ───────────────────────────
+@dataclass
+class ChildBatch:
+    """Activities to score, one column per attribute (index i = activity i)."""
+    name: list[str]
+    description: list[Optional[str]]
+    is_outdoor: np.ndarray         # bool
+    duration_minutes: np.ndarray   # int64, 0 = unknown
+    venue_type: list[Optional[str]]
+
+    @classmethod
+    def from_columns(
+        cls,
+        name: list[str],
+        description: list[Optional[str]],
+        is_outdoor: list[bool],
+        duration_minutes: list[Optional[int]],
+        venue_type: list[Optional[str]],
+    ) -> "ChildBatch":
+        return cls(
+            name=name,
+            description=description,
+            is_outdoor=np.array(is_outdoor, dtype=bool),
+            duration_minutes=np.array([d or 0 for d in duration_minutes], dtype=np.int64),
+            venue_type=venue_type,
+        )
+
+
+def rank_activities_for_children_batch(batch: ChildBatch, top_k: Optional[int] = None) -> list[ChildScore]:
+    """
+    Same scores as rank_activities_for_children, but the arithmetic runs as
+    numpy column operations; only keyword matching and reason text stay
+    per-row. Returns ChildScores best-first — just the top_k when given, so
+    tail rows are never materialized.
+    """
+    n = len(batch.name)
+    if n == 0:
+        return []
+    outdoor = batch.is_outdoor
+    dur = batch.duration_minutes
+
+    # Per-row text work: venue type and keyword hit counts
+    texts = [f"{name} {desc or ''}".lower() for name, desc in zip(batch.name, batch.description)]
+    vtypes = [t or _classify_for_kids(text) for t, text in zip(batch.venue_type, texts)]
+    hits = np.array([_keyword_hits(text) for text in texts], dtype=np.int64).reshape(n, 3)
+    fun_hits, boring_hits, risky_hits = hits[:, 0], hits[:, 1], hits[:, 2]
+
+    def in_types(types: frozenset) -> np.ndarray:
+        return np.array([t in types for t in vtypes], dtype=bool)
+
+    fun = 50.0 + fun_hits * 12 - boring_hits * 15
+    fun += np.where(in_types(KID_FRIENDLY_TYPES), 20, 0)
+    fun += np.where(outdoor, 5, 0)
+    fun += np.select([(dur > 0) & (dur <= 60), dur > 120], [5, -10], 0)
+    fun = np.clip(fun, 0, 100)
+
+    safety = 70.0 - risky_hits * 20
+    safety += np.where(outdoor, 0, 10)
+    safety += np.where(in_types(_SAFE_TYPES), 10, 0)
+    safety -= np.where(in_types(_SUPERVISED_TYPES), 5, 0)
+    safety = np.clip(safety, 0, 100)
+
+    engagement = 50.0 + np.select(
+        [in_types(_ENGAGING_TYPES), in_types(_OPEN_PLAY_TYPES), in_types(_QUIET_TYPES)],
+        [30, 15, -5],
+        0,
+    )
+    engagement += np.where(fun_hits > 0, 15, 0)
+    engagement -= np.where(boring_hits > 0, 20, 0)
+    engagement = np.clip(engagement, 0, 100)
+
+    overall = np.clip((fun * 0.45) + (safety * 0.25) + (engagement * 0.30), 0, 100)
+
+    # Rank on the rounded score (stable, like list.sort) and materialize the top rows
+    rounded = [round(float(o), 1) for o in overall]
+    order = sorted(range(n), key=rounded.__getitem__, reverse=True)
+    if top_k is not None:
+        order = order[:top_k]
+
+    emoji_for = _VENUE_EMOJIS.get
+    scored = []
+    for i in order:
+        o = float(overall[i])
+        duration = int(dur[i]) or None
+        rec, emoji, alternative = _recommendation(
+            o, emoji_for(vtypes[i], "⭐"), vtypes[i], batch.name[i]
         )
-        for a in activities
-    ]
-    scored.sort(key=lambda v: v.overall_score, reverse=True)
+        scored.append(ChildScore(
+            name=batch.name[i],
+            fun_score=round(float(fun[i]), 1),
+            safety_score=round(float(safety[i]), 1),
+            engagement_score=round(float(engagement[i]), 1),
+            overall_score=rounded[i],
+            recommendation=rec,
+            emoji=emoji,
+            reasons=_reasons(float(fun[i]), float(safety[i]), int(risky_hits[i]), bool(outdoor[i]), duration),
+            suggested_alternative=alternative,
+        ))
     return scored
 
 
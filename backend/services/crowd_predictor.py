@@ -4,9 +4,13 @@ returns no data.  Uses venue-type classification, time-of-day curves,
 and day-of-week modifiers to produce realistic predictions.
 """
 
-import re
+from functools import lru_cache
 from typing import Optional, Tuple
 
+import numpy as np
+
+from services import _venue_ac
+
 # ── Venue type keywords ────────────────────────────────────────
 _VENUE_PATTERNS: list[Tuple[str, list[str]]] = [
     ("beach",       ["beach", "shore", "coast", "seaside", "marina"]),
@@ -81,15 +85,70 @@ _DEFAULT_CURVE = [
 # Tourist spots are busier on weekends & holidays
 _DAY_MULTIPLIERS = [0.80, 0.80, 0.85, 0.90, 0.95, 1.15, 1.20]
 
+# ── Precomputed busyness table ────────────────────────────────
+# _BUSY_TABLE[venue_type_id, day, hour] holds the final clamped busyness.
+# Hour index 24 is "no hour given" (curve average) and day index 7 is "no day
+# given" (no multiplier); the last venue row is _DEFAULT_CURVE. Built with the
+# same round() calls as the scalar formula so lookups match it exactly.
+VENUE_TYPES: tuple[str, ...] = tuple(_HOURLY_CURVES)
+VENUE_TYPE_IDS: dict[str, int] = {v: i for i, v in enumerate(VENUE_TYPES)}
+_DEFAULT_ID = len(VENUE_TYPES)
+_NO_HOUR = 24
+_NO_DAY = 7
+
+
+def _build_busy_table() -> np.ndarray:
+    table = np.empty((len(VENUE_TYPES) + 1, 8, 25), dtype=np.uint8)
+    for v, curve in enumerate([*_HOURLY_CURVES.values(), _DEFAULT_CURVE]):
+        bases = [*curve, round(sum(curve) / len(curve))]
+        for d, mult in enumerate([*_DAY_MULTIPLIERS, None]):
+            for h, base in enumerate(bases):
+                if mult is not None:
+                    base = round(base * mult)
+                table[v, d, h] = max(0, min(100, base))
+    return table
+
+
+_BUSY_TABLE = _build_busy_table()
+
+# Groups are ranked in list order, so the first group with a hit anywhere in
+# the text wins (not the leftmost keyword in the text). Labels carry the
+# table row, so classification yields the index with no extra lookup.
+_venue_ac.register("crowd", (
+    (kw, 0, prio, (venue_type, VENUE_TYPE_IDS.get(venue_type, _DEFAULT_ID)))
+    for prio, (venue_type, keywords) in enumerate(_VENUE_PATTERNS)
+    for kw in keywords
+))
+_FALLBACK_TYPE = ("attraction", VENUE_TYPE_IDS["attraction"])
+
+# Venue-specific tip suffixes by (venue_type, hour)
+_TIP_SUFFIX: dict[Tuple[str, int], str] = {}
+for _vt, _hours, _suffix in (
+    ("beach", range(16, 20), " 🌅 Popular sunset hours at the beach."),
+    ("beach", range(5, 8), " 🌅 Great time for a peaceful sunrise walk."),
+    ("temple", range(5, 9), " 🛕 Morning prayers tend to draw crowds."),
+    ("temple", range(17, 20), " 🛕 Evening aarti/prayer rush expected."),
+    ("restaurant", (7, 8, 9), " 🍳 Peak breakfast hours."),
+    ("restaurant", (12, 13, 14), " 🍽️ Lunch rush expected."),
+    ("restaurant", (19, 20, 21), " 🍽️ Dinner rush expected."),
+    ("viewpoint", range(16, 20), " 📸 Sunset viewing — arrive early for best spots."),
+):
+    for _h in _hours:
+        _TIP_SUFFIX[(_vt, _h)] = _suffix
+
 
 def classify_venue(title: str, location: Optional[str] = None) -> str:
     """Classify a venue into a type based on title and location keywords."""
-    text = f"{title} {location or ''}".lower()
-    for venue_type, keywords in _VENUE_PATTERNS:
-        for kw in keywords:
-            if kw in text:
-                return venue_type
-    return "attraction"  # fallback
+    return classify_venue_text(f"{title} {location or ''}".lower())[0]
+
+
+@lru_cache(maxsize=4096)
+def classify_venue_text(text_lower: str) -> Tuple[str, int]:
+    """
+    Classify an already lowercased "title location" text.
+    Returns (venue_type, venue_type_id), the id indexing VENUE_TYPES.
+    """
+    return _venue_ac.classify(text_lower, "crowd", _FALLBACK_TYPE)
 
 
 def predict_busyness(
@@ -104,22 +163,14 @@ def predict_busyness(
     Returns:
         (busyness_pct, optimization_tip, venue_type)
     """
-    venue_type = classify_venue(title, location)
-    curve = _HOURLY_CURVES.get(venue_type, _DEFAULT_CURVE)
+    venue_type, venue_type_id = classify_venue_text(f"{title} {location or ''}".lower())
 
-    # Get base busyness from time curve
-    if hour is not None and 0 <= hour <= 23:
-        base = curve[hour]
-    else:
-        # No time specified — use the average of the curve
-        base = round(sum(curve) / len(curve))
-
-    # Apply day-of-week modifier
-    if day_of_week is not None and 0 <= day_of_week <= 6:
-        base = round(base * _DAY_MULTIPLIERS[day_of_week])
-
-    # Clamp to 0-100
-    busyness = max(0, min(100, base))
+    # Time curve × day-of-week modifier, clamped to 0-100 (see _BUSY_TABLE)
+    busyness = int(_BUSY_TABLE[
+        venue_type_id,
+        day_of_week if day_of_week is not None and 0 <= day_of_week <= 6 else _NO_DAY,
+        hour if hour is not None and 0 <= hour <= 23 else _NO_HOUR,
+    ])
 
     # Generate optimization tip
     if busyness > 80:
@@ -132,25 +183,27 @@ def predict_busyness(
         tip = f"✅ Predicted to be quiet — great time to visit!"
 
     # Add venue-specific suggestion
-    if venue_type == "beach" and hour is not None:
-        if 16 <= hour <= 19:
-            tip += " 🌅 Popular sunset hours at the beach."
-        elif 5 <= hour <= 7:
-            tip += " 🌅 Great time for a peaceful sunrise walk."
-    elif venue_type == "temple" and hour is not None:
-        if 5 <= hour <= 8:
-            tip += " 🛕 Morning prayers tend to draw crowds."
-        elif 17 <= hour <= 19:
-            tip += " 🛕 Evening aarti/prayer rush expected."
-    elif venue_type == "restaurant" and hour is not None:
-        if hour in (7, 8, 9):
-            tip += " 🍳 Peak breakfast hours."
-        elif hour in (12, 13, 14):
-            tip += " 🍽️ Lunch rush expected."
-        elif hour in (19, 20, 21):
-            tip += " 🍽️ Dinner rush expected."
-    elif venue_type == "viewpoint" and hour is not None:
-        if 16 <= hour <= 19:
-            tip += " 📸 Sunset viewing — arrive early for best spots."
+    suffix = _TIP_SUFFIX.get((venue_type, hour))
+    if suffix:
+        tip += suffix
 
     return busyness, tip, venue_type
+
+
+def predict_busyness_batch(
+    venue_type_ids: np.ndarray,
+    hours: np.ndarray,
+    days: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized busyness lookup for many venue/timeslot pairs.
+
+    venue_type_ids index VENUE_TYPES; hours outside 0-23 and days outside 0-6
+    (e.g. -1 for "unknown") fall back like predict_busyness does.
+    Returns a uint8 array of busyness percentages.
+    """
+    hours = np.asarray(hours)
+    days = np.asarray(days)
+    hours = np.where((hours >= 0) & (hours <= 23), hours, _NO_HOUR)
+    days = np.where((days >= 0) & (days <= 6), days, _NO_DAY)
+    return _BUSY_TABLE[venue_type_ids, days, hours]
@@ -9,13 +9,23 @@ Scores activities/venues for elderly suitability based on:
 """
 
 import logging
+import re
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass
 from typing import Optional
-from pydantic import BaseModel
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+from services import _venue_ac
+from services.score_kernels import EFFORT_HIGH, EFFORT_LOW, EFFORT_NONE, PARALLEL_MIN_ROWS, walk_scores
 
 logger = logging.getLogger(__name__)
 
 
-class VenueScore(BaseModel):
+@dataclass(slots=True)
+class VenueScore:
     name: str
     crowd_score: float       # 0-100, higher = more elderly-friendly (less crowded)
     walkability_score: float  # 0-100, higher = less walking required
@@ -26,24 +36,71 @@ class VenueScore(BaseModel):
 
 
 # Activities/types that typically require less physical effort
-LOW_EFFORT_TYPES = {
+LOW_EFFORT_TYPES = frozenset({
     "museum", "cafe", "restaurant", "theater", "cinema", "library",
     "gallery", "spa", "temple", "church", "cathedral", "mall",
     "shopping_mall", "bakery", "tea_house", "hotel",
-}
+})
 
 # Activities that typically require significant walking/effort
-HIGH_EFFORT_TYPES = {
+HIGH_EFFORT_TYPES = frozenset({
     "hiking", "trek", "trail", "mountain", "waterfall", "adventure",
     "sports", "cycling", "surfing", "diving", "climbing", "waterpark",
     "amusement_park", "theme_park", "zoo",
-}
+})
 
 # Keywords that suggest high physical demand
 HIGH_EFFORT_KEYWORDS = [
     "hike", "trek", "climb", "stairs", "steep", "walk", "trail",
     "uphill", "adventure", "sport", "cycling", "surf",
 ]
+# Byte forms for the scan — bytes `in` skips str's per-kind dispatch. Text is
+# encoded with "replace" so non-ASCII chars keep their slot and can't join two
+# neighbours into a false keyword hit.
+_HIGH_EFFORT_KEYWORDS_B = [kw.encode("ascii") for kw in HIGH_EFFORT_KEYWORDS]
+
+
+def _gen_contains_tuple(name: str, keywords: list[bytes]):
+    """
+    Build `name(t) -> (kw0 in t, kw1 in t, ...)` with the keywords baked in as
+    literals, so each check is a single CONTAINS_OP with no list iteration.
+    """
+    body = ", ".join(f"{kw!r} in t" for kw in keywords)
+    ns: dict = {}
+    exec(compile(f"def {name}(t):\n    return ({body},)\n", f"<{name}>", "exec"), ns)
+    return ns[name]
+
+
+_high_effort_mask = _gen_contains_tuple("_high_effort_mask", _HIGH_EFFORT_KEYWORDS_B)
+
+# A long keyword also counts when a description word at least as long is
+# within this fuzz.ratio of it, which catches misspellings ("stairrs",
+# "cyclling") the substring scan misses. Short keywords and shorter words
+# are never fuzzy-matched: "spot"/"port" would match "sport" and "stars"
+# would match "stairs". Plurals are already substring hits.
+_FUZZY_CUTOFF = 85
+_FUZZY_MIN_LEN = 6
+_FUZZY_KEYWORDS = [kw for kw in HIGH_EFFORT_KEYWORDS if len(kw) >= _FUZZY_MIN_LEN]
+_FUZZY_KEYWORD_IDX = np.array([HIGH_EFFORT_KEYWORDS.index(kw) for kw in _FUZZY_KEYWORDS], dtype=np.intp)
+_FUZZY_KEYWORD_LEN = np.array([len(kw) for kw in _FUZZY_KEYWORDS])
+_WORD_RE = re.compile(r"[a-z]+")
+
+# Effort class of a venue type, by substring: a high-effort hit wins over a
+# low-effort one
+_venue_ac.register("effort", [
+    *((t, 0, 0, EFFORT_HIGH) for t in HIGH_EFFORT_TYPES),
+    *((t, 0, 1, EFFORT_LOW) for t in LOW_EFFORT_TYPES),
+])
+
+
+# Walkability penalty tiers. A value strictly above the k-th threshold earns
+# the penalty at index k+1; bisect_left counts the thresholds below the value.
+_DIST_THR = (1, 2, 3, 5)
+_DIST_PEN = (0, 8, 15, 25, 35)
+_STEP_THR = (1500, 3000, 5000, 8000)
+_STEP_PEN = (0, 5, 10, 20, 35)
+_DUR_THR = (60, 120, 180)
+_DUR_PEN = (0, 5, 12, 20)
 
 
 def compute_crowd_score(busyness_pct: Optional[float]) -> float:
@@ -66,10 +123,10 @@ def estimate_steps_from_duration(
 
     # Determine walking rate based on activity context
     if venue_type:
-        vtype = venue_type.lower()
-        if any(t in vtype for t in HIGH_EFFORT_TYPES):
+        effort = _venue_ac.classify(venue_type.lower(), "effort", EFFORT_NONE)
+        if effort == EFFORT_HIGH:
             steps_per_min = 90  # hiking, trekking etc.
-        elif any(t in vtype for t in LOW_EFFORT_TYPES):
+        elif effort == EFFORT_LOW:
             steps_per_min = 20  # seated activities
         elif is_outdoor:
             steps_per_min = 70
@@ -97,10 +154,10 @@ def estimate_distance_from_duration(
     hours = duration_minutes / 60.0
 
     if venue_type:
-        vtype = venue_type.lower()
-        if any(t in vtype for t in HIGH_EFFORT_TYPES):
+        effort = _venue_ac.classify(venue_type.lower(), "effort", EFFORT_NONE)
+        if effort == EFFORT_HIGH:
             km_per_hour = 3.5  # active outdoor
-        elif any(t in vtype for t in LOW_EFFORT_TYPES):
+        elif effort == EFFORT_LOW:
             km_per_hour = 0.5  # mostly seated
         elif is_outdoor:
             km_per_hour = 3.0
@@ -128,26 +185,12 @@ def compute_walkability_score(
     score = 70.0  # default neutral-good
 
     # ── Distance-based penalties (most reliable signal) ──
-    if distance_km is not None and distance_km > 0:
-        if distance_km > 5:
-            score -= 35
-        elif distance_km > 3:
-            score -= 25
-        elif distance_km > 2:
-            score -= 15
-        elif distance_km > 1:
-            score -= 8
+    if distance_km is not None:
+        score -= _DIST_PEN[bisect_left(_DIST_THR, distance_km)]
 
     # ── Steps-based penalties ──
-    if estimated_steps is not None and estimated_steps > 0:
-        if estimated_steps > 8000:
-            score -= 35
-        elif estimated_steps > 5000:
-            score -= 20
-        elif estimated_steps > 3000:
-            score -= 10
-        elif estimated_steps > 1500:
-            score -= 5
+    if estimated_steps is not None:
+        score -= _STEP_PEN[bisect_left(_STEP_THR, estimated_steps)]
 
     # ── Indoor vs outdoor ──
     if is_outdoor:
@@ -155,26 +198,19 @@ def compute_walkability_score(
 
     # ── Duration penalty (longer = more tiring) ──
     if duration_minutes:
-        if duration_minutes > 180:
-            score -= 20
-        elif duration_minutes > 120:
-            score -= 12
-        elif duration_minutes > 60:
-            score -= 5
+        score -= _DUR_PEN[bisect_left(_DUR_THR, duration_minutes)]
 
     # ── Type-based adjustments ──
     if venue_type:
-        vtype = venue_type.lower()
-        if any(t in vtype for t in HIGH_EFFORT_TYPES):
+        effort = _venue_ac.classify(venue_type.lower(), "effort", EFFORT_NONE)
+        if effort == EFFORT_HIGH:
             score -= 25
-        elif any(t in vtype for t in LOW_EFFORT_TYPES):
+        elif effort == EFFORT_LOW:
             score += 15
 
     # ── Description keyword scan ──
     if description:
-        desc_lower = description.lower()
-        effort_hits = sum(1 for kw in HIGH_EFFORT_KEYWORDS if kw in desc_lower)
-        score -= effort_hits * 8
+        score -= _effort_hits(description) * 8
 
     return max(0, min(100, score))
 
@@ -197,6 +233,71 @@ def compute_accessibility_score(
     return max(0, min(100, score))
 
 
+def _score_elderly_fused(
+    busyness_pct: Optional[float],
+    is_outdoor: bool,
+    duration_minutes: Optional[int],
+    venue_type: Optional[str],
+    description: Optional[str],
+    has_seating: bool,
+    distance_km: Optional[float],
+    estimated_steps: Optional[int],
+) -> tuple[float, float, float, float, float, int]:
+    """
+    compute_crowd/walkability/accessibility_score and the distance/steps
+    estimates in one pass: the venue type is lowercased and classified once
+    and shared by every part. Returns
+    (crowd, walk, access, overall, distance_km, estimated_steps).
+    """
+    vtype = sys.intern(venue_type.lower()) if venue_type else None
+    effort = _effort_id(vtype)
+
+    # Auto-estimate distance and steps if not provided
+    if duration_minutes:
+        steps_per_min, km_per_hour = _walk_rates(effort, is_outdoor)
+        if distance_km is None:
+            distance_km = round(duration_minutes / 60.0 * km_per_hour, 2)
+        if estimated_steps is None:
+            estimated_steps = int(duration_minutes * steps_per_min)
+    else:
+        if distance_km is None:
+            distance_km = 0.0
+        if estimated_steps is None:
+            estimated_steps = 0
+
+    # ── Crowd ──
+    crowd = 50.0 if busyness_pct is None else max(0, min(100, 100 - busyness_pct))
+
+    # ── Walkability ──
+    walk = 70.0 - _DIST_PEN[bisect_left(_DIST_THR, distance_km)]
+    walk -= _STEP_PEN[bisect_left(_STEP_THR, estimated_steps)]
+    if is_outdoor:
+        walk -= 10
+    if duration_minutes:
+        walk -= _DUR_PEN[bisect_left(_DUR_THR, duration_minutes)]
+    if effort == EFFORT_HIGH:
+        walk -= 25
+    elif effort == EFFORT_LOW:
+        walk += 15
+    if description:
+        walk -= _effort_hits(description) * 8
+    walk = max(0, min(100, walk))
+
+    # ── Accessibility ──
+    access = 60.0
+    if not is_outdoor:
+        access += 20
+    if has_seating:
+        access += 10
+    if vtype in LOW_EFFORT_TYPES:
+        access += 10
+    access = max(0, min(100, access))
+
+    # Weighted: crowd matters most for elderly, then walkability
+    overall = (crowd * 0.35) + (walk * 0.40) + (access * 0.25)
+    return crowd, walk, access, overall, distance_km, estimated_steps
+
+
 def score_venue_for_elderly(
     name: str,
     busyness_pct: Optional[float] = None,
@@ -209,106 +310,396 @@ def score_venue_for_elderly(
     estimated_steps: Optional[int] = None,
 ) -> VenueScore:
     """Compute overall elderly-friendly score for a venue/activity."""
+    crowd, walk, access, overall, distance_km, estimated_steps = _score_elderly_fused(
+        busyness_pct, is_outdoor, duration_minutes, venue_type, description,
+        has_seating, distance_km, estimated_steps,
+    )
 
-    # Auto-estimate distance and steps if not provided
-    if distance_km is None:
-        distance_km = estimate_distance_from_duration(duration_minutes, is_outdoor, venue_type)
-    if estimated_steps is None:
-        estimated_steps = estimate_steps_from_duration(duration_minutes, is_outdoor, venue_type)
-
-    crowd = compute_crowd_score(busyness_pct)
-    walk = compute_walkability_score(
-        is_outdoor, duration_minutes, venue_type, description,
-        distance_km, estimated_steps,
+    reasons = _reasons(
+        busyness_pct, crowd, walk, is_outdoor, duration_minutes, distance_km, estimated_steps,
     )
-    access = compute_accessibility_score(not is_outdoor, venue_type, has_seating)
+    rec = _recommendation(overall)
 
-    # Weighted: crowd matters most for elderly, then walkability
-    overall = (crowd * 0.35) + (walk * 0.40) + (access * 0.25)
+    logger.debug(
+        f"Scored '{name}': crowd={crowd:.0f}, walk={walk:.0f}, access={access:.0f}, "
+        f"overall={overall:.0f}, steps={estimated_steps}, dist={distance_km:.1f}km"
+    )
 
-    # Generate detailed reasons
-    reasons = []
+    return VenueScore(
+        name=name,
+        crowd_score=round(crowd, 1),
+        walkability_score=round(walk, 1),
+        accessibility_score=round(access, 1),
+        overall_score=round(overall, 1),
+        recommendation=rec,
+        reasons=reasons,
+    )
+
+
+# Reason texts. Constant ones are shared strings; the rest are bound
+# str.format templates, so each bullet is one call with no f-string parsing.
+_R_LOW_CROWD = "Low crowd levels — comfortable for elderly visitors"
+_R_HIGH_CROWD = "⚠️ High crowd levels — may be uncomfortable"
+_R_MODERATE_CROWD = "Moderate crowd levels ({}% busy)".format
+_R_NO_CROWD_DATA = "ℹ️ Crowd data unavailable — score is estimated"
+_R_STEPS_MANY = "⚠️ ~{:,} steps estimated — plan rest breaks and consider taxi".format
+_R_STEPS_MODERATE = "~{:,} steps — moderate walking involved".format
+_R_STEPS_LIGHT = "~{:,} steps — light walking".format
+_R_DIST_FAR = "⚠️ ~{:.1f} km distance — consider taxi or auto-rickshaw".format
+_R_DIST_MANAGEABLE = "~{:.1f} km — manageable walking distance".format
+_R_EASY_EFFORT = "Minimal physical effort required"
+_R_HARD_EFFORT = "⚠️ Significant physical effort needed"
+_R_INDOOR = "Indoor venue — weather-protected"
+_R_OUTDOOR = "Outdoor venue — check weather conditions"
+_R_LONG_DURATION = "⚠️ Long duration ({} min) — plan rest breaks".format
+
+
+# Reasons are first computed as a bitfield (one flag per bullet) plus the
+# numbers they quote, and only expanded to text for rows actually returned.
+_F_LOW_CROWD = 1 << 0
+_F_HIGH_CROWD = 1 << 1
+_F_MODERATE_CROWD = 1 << 2
+_F_NO_CROWD_DATA = 1 << 3
+_F_STEPS_MANY = 1 << 4
+_F_STEPS_MODERATE = 1 << 5
+_F_STEPS_LIGHT = 1 << 6
+_F_DIST_FAR = 1 << 7
+_F_DIST_MANAGEABLE = 1 << 8
+_F_EASY_EFFORT = 1 << 9
+_F_HARD_EFFORT = 1 << 10
+_F_INDOOR = 1 << 11
+_F_OUTDOOR = 1 << 12
+_F_LONG_DURATION = 1 << 13
+
+# (flag, text or template, index into params), in display order
+_REASON_TABLE = (
+    (_F_LOW_CROWD, _R_LOW_CROWD, None),
+    (_F_HIGH_CROWD, _R_HIGH_CROWD, None),
+    (_F_MODERATE_CROWD, _R_MODERATE_CROWD, 0),
+    (_F_NO_CROWD_DATA, _R_NO_CROWD_DATA, None),
+    (_F_STEPS_MANY, _R_STEPS_MANY, 1),
+    (_F_STEPS_MODERATE, _R_STEPS_MODERATE, 1),
+    (_F_STEPS_LIGHT, _R_STEPS_LIGHT, 1),
+    (_F_DIST_FAR, _R_DIST_FAR, 2),
+    (_F_DIST_MANAGEABLE, _R_DIST_MANAGEABLE, 2),
+    (_F_EASY_EFFORT, _R_EASY_EFFORT, None),
+    (_F_HARD_EFFORT, _R_HARD_EFFORT, None),
+    (_F_INDOOR, _R_INDOOR, None),
+    (_F_OUTDOOR, _R_OUTDOOR, None),
+    (_F_LONG_DURATION, _R_LONG_DURATION, 3),
+)
+
+
+def _reason_flags(
+    busyness_pct: Optional[float],
+    crowd: float,
+    walk: float,
+    is_outdoor: bool,
+    duration_minutes: Optional[int],
+    distance_km: float,
+    estimated_steps: int,
+) -> int:
+    """Reason bitfield for a scored venue (see expand_reasons)."""
+    flags = 0
 
     # Crowd reasons
     if busyness_pct is not None:
         if crowd >= 70:
-            reasons.append("Low crowd levels — comfortable for elderly visitors")
+            flags |= _F_LOW_CROWD
         elif crowd <= 30:
-            reasons.append("⚠️ High crowd levels — may be uncomfortable")
+            flags |= _F_HIGH_CROWD
         else:
-            reasons.append(f"Moderate crowd levels ({round(busyness_pct)}% busy)")
+            flags |= _F_MODERATE_CROWD
     else:
-        reasons.append("ℹ️ Crowd data unavailable — score is estimated")
+        flags |= _F_NO_CROWD_DATA
 
     # Walkability reasons with actual numbers
     if estimated_steps > 0:
         if estimated_steps > 6000:
-            reasons.append(f"⚠️ ~{estimated_steps:,} steps estimated — plan rest breaks and consider taxi")
+            flags |= _F_STEPS_MANY
         elif estimated_steps > 3000:
-            reasons.append(f"~{estimated_steps:,} steps — moderate walking involved")
+            flags |= _F_STEPS_MODERATE
         else:
-            reasons.append(f"~{estimated_steps:,} steps — light walking")
+            flags |= _F_STEPS_LIGHT
 
     if distance_km > 0:
         if distance_km > 3:
-            reasons.append(f"⚠️ ~{distance_km:.1f} km distance — consider taxi or auto-rickshaw")
+            flags |= _F_DIST_FAR
         elif distance_km > 1:
-            reasons.append(f"~{distance_km:.1f} km — manageable walking distance")
+            flags |= _F_DIST_MANAGEABLE
 
     if walk >= 70:
-        reasons.append("Minimal physical effort required")
+        flags |= _F_EASY_EFFORT
     elif walk <= 40:
-        reasons.append("⚠️ Significant physical effort needed")
+        flags |= _F_HARD_EFFORT
 
-    if not is_outdoor:
-        reasons.append("Indoor venue — weather-protected")
-    else:
-        reasons.append("Outdoor venue — check weather conditions")
+    flags |= _F_OUTDOOR if is_outdoor else _F_INDOOR
 
     if duration_minutes and duration_minutes > 120:
-        reasons.append(f"⚠️ Long duration ({duration_minutes} min) — plan rest breaks")
+        flags |= _F_LONG_DURATION
+
+    return flags
+
+
+def _reason_flags_batch(
+    known: np.ndarray,
+    crowd: np.ndarray,
+    walk: np.ndarray,
+    is_outdoor: np.ndarray,
+    duration_minutes: np.ndarray,
+    distance_km: np.ndarray,
+    estimated_steps: np.ndarray,
+) -> np.ndarray:
+    """_reason_flags over batch columns (known = busyness is not NaN)."""
+    crowd_flag = np.select([crowd >= 70, crowd <= 30], [_F_LOW_CROWD, _F_HIGH_CROWD], _F_MODERATE_CROWD)
+    return (
+        np.where(known, crowd_flag, _F_NO_CROWD_DATA)
+        | np.select(
+            [estimated_steps > 6000, estimated_steps > 3000, estimated_steps > 0],
+            [_F_STEPS_MANY, _F_STEPS_MODERATE, _F_STEPS_LIGHT], 0,
+        )
+        | np.select([distance_km > 3, distance_km > 1], [_F_DIST_FAR, _F_DIST_MANAGEABLE], 0)
+        | np.select([walk >= 70, walk <= 40], [_F_EASY_EFFORT, _F_HARD_EFFORT], 0)
+        | np.where(is_outdoor, _F_OUTDOOR, _F_INDOOR)
+        | np.where(duration_minutes > 120, _F_LONG_DURATION, 0)
+    )
 
-    # Recommendation tier
-    if overall >= 75:
-        rec = "Highly Recommended"
-    elif overall >= 55:
-        rec = "Suitable"
-    elif overall >= 35:
-        rec = "Use Caution"
-    else:
-        rec = "Not Recommended"
 
-    logger.debug(
-        f"Scored '{name}': crowd={crowd:.0f}, walk={walk:.0f}, access={access:.0f}, "
-        f"overall={overall:.0f}, steps={estimated_steps}, dist={distance_km:.1f}km"
+def expand_reasons(flags: int, params: tuple) -> list[str]:
+    """
+    Explanation bullets for a reason bitfield. params is
+    (busyness_pct, estimated_steps, distance_km, duration_minutes).
+    """
+    reasons = []
+    for flag, text, param in _REASON_TABLE:
+        if flags & flag:
+            if param is None:
+                reasons.append(text)
+            elif param == 0:
+                reasons.append(text(round(params[0])))
+            else:
+                reasons.append(text(params[param]))
+    return reasons
+
+
+def _reasons(
+    busyness_pct: Optional[float],
+    crowd: float,
+    walk: float,
+    is_outdoor: bool,
+    duration_minutes: Optional[int],
+    distance_km: float,
+    estimated_steps: int,
+) -> list[str]:
+    """Explanation bullets for a scored venue."""
+    flags = _reason_flags(
+        busyness_pct, crowd, walk, is_outdoor, duration_minutes, distance_km, estimated_steps,
     )
+    return expand_reasons(flags, (busyness_pct, estimated_steps, distance_km, duration_minutes))
 
-    return VenueScore(
-        name=name,
-        crowd_score=round(crowd, 1),
-        walkability_score=round(walk, 1),
-        accessibility_score=round(access, 1),
-        overall_score=round(overall, 1),
-        recommendation=rec,
-        reasons=reasons,
-    )
+
+def _recommendation(overall: float) -> str:
+    """Recommendation tier for an overall score."""
+    if overall >= 75:
+        return "Highly Recommended"
+    elif overall >= 55:
+        return "Suitable"
+    elif overall >= 35:
+        return "Use Caution"
+    return "Not Recommended"
 
 
 def rank_activities_for_elderly(activities: list[dict]) -> list[VenueScore]:
     """Score and rank a list of activities for elderly suitability."""
-    scored = [
-        score_venue_for_elderly(
-            name=a.get("name") or a.get("title", "Unknown"),
-            busyness_pct=a.get("busyness_pct"),
-            is_outdoor=a.get("is_outdoor", False),
-            duration_minutes=a.get("duration_minutes"),
-            venue_type=a.get("type") or a.get("category"),
-            description=a.get("description"),
-            has_seating=a.get("has_seating", True),
-            distance_km=a.get("distance_km"),
-            estimated_steps=a.get("estimated_steps"),
+    return rank_activities_for_elderly_batch(ElderlyBatch.from_columns(
+        name=[a.get("name") or a.get("title", "Unknown") for a in activities],
+        busyness_pct=[a.get("busyness_pct") for a in activities],
+        is_outdoor=[a.get("is_outdoor", False) for a in activities],
+        duration_minutes=[a.get("duration_minutes") for a in activities],
+        venue_type=[a.get("type") or a.get("category") for a in activities],
+        description=[a.get("description") for a in activities],
+        has_seating=[a.get("has_seating", True) for a in activities],
+        distance_km=[a.get("distance_km") for a in activities],
+        estimated_steps=[a.get("estimated_steps") for a in activities],
+    ))
+
+
+# ── Batch (column-oriented) scoring ───────────────────────────
+@dataclass
+class ElderlyBatch:
+    """
+    Activities to score, one column per attribute (index i = activity i).
+    Unknown values: busyness_pct / distance_km NaN, duration_minutes 0,
+    estimated_steps -1. Missing distance/steps are estimated from duration.
+    venue_type is stored lowercased (and interned), so scoring never
+    re-lowers it.
+    """
+    name: list[str]
+    busyness_pct: np.ndarray       # float64
+    is_outdoor: np.ndarray         # bool
+    duration_minutes: np.ndarray   # int64
+    has_seating: np.ndarray        # bool
+    venue_type: list[Optional[str]]
+    description: list[Optional[str]]
+    distance_km: np.ndarray        # float64
+    estimated_steps: np.ndarray    # int64
+
+    @classmethod
+    def from_columns(
+        cls,
+        name: list[str],
+        busyness_pct: list[Optional[float]],
+        is_outdoor: list[bool],
+        duration_minutes: list[Optional[int]],
+        venue_type: list[Optional[str]],
+        description: list[Optional[str]],
+        has_seating: Optional[list[bool]] = None,
+        distance_km: Optional[list[Optional[float]]] = None,
+        estimated_steps: Optional[list[Optional[int]]] = None,
+    ) -> "ElderlyBatch":
+        n = len(name)
+        return cls(
+            name=name,
+            busyness_pct=np.array([np.nan if b is None else b for b in busyness_pct], dtype=np.float64),
+            is_outdoor=np.array(is_outdoor, dtype=bool),
+            duration_minutes=np.array([d or 0 for d in duration_minutes], dtype=np.int64),
+            has_seating=np.array(has_seating if has_seating is not None else [True] * n, dtype=bool),
+            venue_type=[sys.intern(t.lower()) if t else None for t in venue_type],
+            description=description,
+            distance_km=(
+                np.array([np.nan if d is None else d for d in distance_km], dtype=np.float64)
+                if distance_km is not None else np.full(n, np.nan)
+            ),
+            estimated_steps=(
+                np.array([-1 if s is None else s for s in estimated_steps], dtype=np.int64)
+                if estimated_steps is not None else np.full(n, -1, dtype=np.int64)
+            ),
+        )
+
+
+def _effort_id(venue_type_lc: Optional[str]) -> int:
+    """Encode a lowercased venue type's effort class as an int for the numba kernels."""
+    if not venue_type_lc:
+        return EFFORT_NONE
+    return _venue_ac.classify(venue_type_lc, "effort", EFFORT_NONE)
+
+
+def _walk_rates(effort: int, is_outdoor: bool) -> tuple[int, float]:
+    """(steps per minute, km per hour) used by the duration-based estimates."""
+    if effort == EFFORT_HIGH:
+        return 90, 3.5  # hiking, trekking etc.
+    if effort == EFFORT_LOW:
+        return 20, 0.5  # seated activities
+    if is_outdoor:
+        return 70, 3.0
+    return 30, 1.5
+
+
+def _effort_hits(description: Optional[str]) -> int:
+    return int(_effort_hits_batch([description])[0])
+
+
+def _effort_hits_batch(descriptions: list[Optional[str]]) -> np.ndarray:
+    """
+    Distinct HIGH_EFFORT_KEYWORDS hit by each description, either as a
+    substring or as a fuzzy word match. All words of all descriptions go
+    through a single rapidfuzz cdist call.
+    """
+    n = len(descriptions)
+    hit = np.zeros((n, len(HIGH_EFFORT_KEYWORDS)), dtype=bool)
+    words: list[str] = []
+    owner: list[int] = []
+    for i, description in enumerate(descriptions):
+        if not description:
+            continue
+        desc_lower = description.lower()
+        desc_b = desc_lower.encode("ascii", "replace")
+        hit[i] = _high_effort_mask(desc_b)
+        row_words = [w for w in _WORD_RE.findall(desc_lower) if len(w) >= _FUZZY_MIN_LEN]
+        words.extend(row_words)
+        owner.extend([i] * len(row_words))
+
+    if words:
+        scores = process.cdist(
+            words, _FUZZY_KEYWORDS,
+            scorer=fuzz.ratio, score_cutoff=_FUZZY_CUTOFF, dtype=np.uint8,
+            # A thread pool only pays off for big batches (cf. walk_scores)
+            workers=-1 if n >= PARALLEL_MIN_ROWS else 1,
         )
-        for a in activities
-    ]
-    scored.sort(key=lambda v: v.overall_score, reverse=True)
+        word_len = np.array([len(w) for w in words])
+        fuzzy_hit = (scores >= _FUZZY_CUTOFF) & (word_len[:, None] >= _FUZZY_KEYWORD_LEN)
+        row_hit = np.zeros((n, len(_FUZZY_KEYWORDS)), dtype=bool)
+        np.logical_or.at(row_hit, np.asarray(owner), fuzzy_hit)
+        hit[:, _FUZZY_KEYWORD_IDX] |= row_hit
+    return hit.sum(axis=1)
+
+
+def rank_activities_for_elderly_batch(batch: ElderlyBatch, top_k: Optional[int] = None) -> list[VenueScore]:
+    """
+    Same scores as rank_activities_for_elderly, but the numeric parts run as
+    numpy column operations; only the string checks and reason text stay
+    per-row. Returns VenueScores best-first — just the top_k when given, so
+    tail rows are never materialized.
+    """
+    n = len(batch.name)
+    if n == 0:
+        return []
+    outdoor = batch.is_outdoor
+    dur = batch.duration_minutes
+
+    effort = np.array([_effort_id(t) for t in batch.venue_type], dtype=np.int64)
+
+    # Fill in estimates where distance/steps weren't provided
+    dist = batch.distance_km.copy()
+    steps = batch.estimated_steps.copy()
+    for i in np.flatnonzero(np.isnan(dist)):
+        _, km_per_hour = _walk_rates(effort[i], outdoor[i])
+        dist[i] = round(int(dur[i]) / 60.0 * km_per_hour, 2)
+    for i in np.flatnonzero(steps < 0):
+        steps_per_min, _ = _walk_rates(effort[i], outdoor[i])
+        steps[i] = int(dur[i]) * steps_per_min
+
+    busy = batch.busyness_pct
+    known = ~np.isnan(busy)
+    crowd = np.where(known, np.clip(100 - np.nan_to_num(busy), 0, 100), 50.0)
+
+    walk = walk_scores(
+        dist,
+        steps,
+        outdoor,
+        dur,
+        effort,
+        _effort_hits_batch(batch.description).astype(np.int64),
+    )
+
+    low_type = np.array([t in LOW_EFFORT_TYPES for t in batch.venue_type])
+    access = np.clip(
+        60.0 + np.where(outdoor, 0, 20) + np.where(batch.has_seating, 10, 0) + np.where(low_type, 10, 0),
+        0, 100,
+    )
+
+    overall = (crowd * 0.35) + (walk * 0.40) + (access * 0.25)
+    flags = _reason_flags_batch(known, crowd, walk, outdoor, dur, dist, steps)
+
+    # Rank on the rounded score (stable, like list.sort) and materialize the top rows
+    rounded = [round(float(o), 1) for o in overall]
+    order = sorted(range(n), key=rounded.__getitem__, reverse=True)
+    if top_k is not None:
+        order = order[:top_k]
+
+    scored = []
+    for i in order:
+        busyness = float(busy[i]) if known[i] else None
+        o = float(overall[i])
+        scored.append(VenueScore(
+            name=batch.name[i],
+            crowd_score=round(float(crowd[i]), 1),
+            walkability_score=round(float(walk[i]), 1),
+            accessibility_score=round(float(access[i]), 1),
+            overall_score=rounded[i],
+            recommendation=_recommendation(o),
+            reasons=expand_reasons(
+                int(flags[i]), (busyness, int(steps[i]), float(dist[i]), int(dur[i])),
+            ),
+        ))
     return scored
@@ -0,0 +1,86 @@
+"""
+Numba kernels over stacked BestTime forecasts.
+
+Venues' week_raw grids are stacked into one (n_venues, 7, 24) float64 array
+so the per-venue statistics run as a single compiled loop instead of a
+Python walk over 168 values per venue.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+from numba import njit, prange
+
+from services.score_kernels import PARALLEL_MIN_ROWS
+
+
+@njit(inline="always")
+def _venue_stats(week, i, means, counts):
+    s = 0.0
+    c = 0
+    for d in range(week.shape[1]):
+        for h in range(week.shape[2]):
+            v = week[i, d, h]
+            if v > 0:
+                s += v
+                c += 1
+    if c:
+        means[i] = s / c
+    counts[i] = c
+
+
+@njit(cache=True)
+def _weekly_stats_serial(week):
+    n = week.shape[0]
+    means = np.zeros(n, np.float64)
+    counts = np.zeros(n, np.int64)
+    for i in range(n):
+        _venue_stats(week, i, means, counts)
+    return means, counts
+
+
+@njit(parallel=True, cache=True)
+def _weekly_stats_parallel(week):
+    n = week.shape[0]
+    means = np.zeros(n, np.float64)
+    counts = np.zeros(n, np.int64)
+    for i in prange(n):
+        _venue_stats(week, i, means, counts)
+    return means, counts
+
+
+def weekly_stats(week: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Mean of the positive hours and how many there were, per venue. Venues
+    are split across numba's thread pool only for batches of at least
+    PARALLEL_MIN_ROWS.
+    """
+    kernel = _weekly_stats_parallel if len(week) >= PARALLEL_MIN_ROWS else _weekly_stats_serial
+    return kernel(week)
+
+
+def weekly_means(grids: list[Any]) -> list[Optional[float]]:
+    """
+    Mean busyness for each week_raw grid, computed in one kernel call.
+    None for grids with no positive hours or that aren't a numeric 7x24
+    grid — callers fall back to the pure-Python walk for those.
+    """
+    out: list[Optional[float]] = [None] * len(grids)
+    rows: list[int] = []
+    week = np.zeros((len(grids), 7, 24), np.float64)
+    for i, grid in enumerate(grids):
+        try:
+            arr = np.asarray(grid, dtype=np.float64)
+        except (TypeError, ValueError):
+            continue
+        if arr.shape != (7, 24):
+            continue
+        week[len(rows)] = arr
+        rows.append(i)
+
+    if rows:
+        means, counts = weekly_stats(week[: len(rows)])
+        for j, i in enumerate(rows):
+            if counts[j]:
+                out[i] = float(means[j])
+    return out
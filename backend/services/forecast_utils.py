@@ -0,0 +1,106 @@
+"""
+Helpers for digging venues and busyness values out of BestTime responses.
+
+These are plain dict-walking functions called once per venue per request.
+They're kept free of FastAPI imports and fully annotated so this module can
+be compiled with mypyc (`make compile`); the pure-Python file is used when
+no compiled extension is present.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+
+_VENUE_KEYS = ("venues", "venues_forecasts", "venue_info")
+
+# ── Helper: hour from an "HH:MM" start time ────────────────────
+def parse_hour(start_time: Optional[str]) -> Optional[int]:
+    """Hour from "HH:MM" (or a bare "HH"); None when missing or unparseable."""
+    if not start_time:
+        return None
+    try:
+        # partition avoids building the list split(":") would
+        return int(start_time.partition(":")[0])
+    except ValueError:
+        return None
+
+
+# ── Helper: average busyness over a week_raw grid ─────────────
+def week_avg(week_raw: Any) -> Optional[float]:
+    """Mean of the non-zero hours in a BestTime week_raw grid, or None."""
+    if not week_raw:
+        return None
+    try:
+        # Well-formed 7x24 grid — one vectorized pass instead of 168 isinstance checks
+        arr = np.asarray(week_raw, dtype=np.float64)
+    except (TypeError, ValueError):
+        # Ragged or non-numeric data — walk it by hand
+        all_hours: list[float] = []
+        for day in week_raw:
+            if isinstance(day, list):
+                all_hours.extend([h for h in day if isinstance(h, (int, float)) and h > 0])
+        return sum(all_hours) / len(all_hours) if all_hours else None
+    pos = arr[arr > 0]
+    return float(pos.mean()) if pos.size else None
+
+
+# ── Helper: extract venues from BestTime progress response ────
+# `data` is whatever BestTime returned, so it's typed Any — mypyc checks
+# annotations at runtime and a narrower type would reject bad payloads
+# with a TypeError instead of returning [].
+def extract_venues_from_progress(data: Any) -> list[dict[str, Any]]:
+    """
+    BestTime venue_search returns progress data. Venues may be found
+    in 'venues' (raw format), 'venues_forecasts', or nested under
+    'venue_info' in individual items.
+    Handles both dict and list responses from the API.
+    """
+    # If data is already a list of venues, return it directly
+    if isinstance(data, list):
+        return data
+
+    # If data is not a dict, return empty
+    if not isinstance(data, dict):
+        return []
+
+    # Direct venues list (raw format from progress endpoint), then venue
+    # forecasts, then the 'venue_info' wrapper — first non-empty list wins
+    for key in _VENUE_KEYS:
+        venues = data.get(key)
+        if isinstance(venues, list) and venues:
+            return venues
+
+    return []
+
+
+# ── Helper: extract busyness from venue data ──────────────────
+def extract_busyness_from_venue(
+    venue: dict[str, Any],
+    day_of_week: Optional[int] = None,
+    hour: Optional[int] = None,
+) -> Optional[float]:
+    """Try multiple paths to extract busyness from a venue dict."""
+    # Try venue_foot_traffic_forecast first
+    ft: dict[str, Any] = venue.get("venue_foot_traffic_forecast") or venue.get("forecast") or {}
+    analysis: dict[str, Any] = ft.get("analysis", {})
+
+    # Try to get specific day+hour data
+    if day_of_week is not None:
+        day_raw: list[Any] = analysis.get("day_raw", [])
+        if day_raw and hour is not None and 0 <= hour < len(day_raw):
+            val = day_raw[hour]
+            if isinstance(val, (int, float)) and val >= 0:
+                return float(val)
+
+    # Try week_raw for average
+    avg = week_avg(analysis.get("week_raw"))
+    if avg is not None:
+        return round(avg, 1)
+
+    # Try direct busyness fields
+    for key in ["venue_forecasted_busyness", "busyness", "busy_pct"]:
+        val = venue.get(key)
+        if isinstance(val, (int, float)):
+            return float(val)
+
+    return None
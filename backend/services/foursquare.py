@@ -4,10 +4,19 @@ Replaces deprecated Foursquare Places API v3.
 Searches for nearby venues (hotels, restaurants, attractions) using Mapbox's POI geocoding.
 """
 
+import asyncio
 import logging
 import os
+import random
+import time
+from functools import lru_cache
 from typing import Optional
 import httpx
+import orjson
+from aiolimiter import AsyncLimiter
+from pydantic import BaseModel, TypeAdapter
+
+from services import _geo_cache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +35,122 @@ CATEGORY_MAP = {
     "nightlife": "bar,pub,nightclub",
 }
 
+# Lookup table keyed by normalized (lowercased) category name — built once
+CATEGORY_MAP_LOWER: dict[str, str] = {k.lower(): v for k, v in CATEGORY_MAP.items()}
+
+# First search term per category (e.g. "hotels" -> "hotel"), used as the single
+# POI query when searching around route points
+CATEGORY_PRIMARY: dict[str, str] = {k: v.split(",")[0].strip() for k, v in CATEGORY_MAP_LOWER.items()}
+
+
+# One pooled client for every Mapbox call (geocoding, POI search, directions),
+# so repeat requests reuse warm HTTP/2 connections instead of a fresh
+# DNS + TCP + TLS handshake each. Created on first use, closed by the app lifespan.
+# With HTTP/2 the fanned-out route POI searches share one multiplexed
+# connection instead of queueing for pool sockets.
+_client: Optional[httpx.AsyncClient] = None
+_seen_http_versions: set[str] = set()
+
+
+async def _log_http_version(response: httpx.Response):
+    """Log the negotiated protocol once per version (confirms HTTP/2 is in use)."""
+    if response.http_version not in _seen_http_versions:
+        _seen_http_versions.add(response.http_version)
+        logger.info(f"Mapbox responses over {response.http_version}")
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=15.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=64,
+                max_keepalive_connections=32,
+                keepalive_expiry=60.0,
+            ),
+            event_hooks={"response": [_log_http_version]},
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Mapbox allows ~600 geocoding requests/min per token. Every Mapbox call in
+# this process goes through a token bucket, so a fanned-out route search waits
+# for capacity instead of collecting 429s. The bucket is per process: each of
+# the WEB_CONCURRENCY workers (exported by start.sh) gets an equal share of
+# MAPBOX_RATE_LIMIT, keeping the combined rate just under the token's limit.
+MAPBOX_RATE_LIMIT = 550  # requests per minute, across all workers
+MAPBOX_MAX_ATTEMPTS = 5
+_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+_limiter = AsyncLimiter(MAPBOX_RATE_LIMIT / _WORKERS, 60)
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """Seconds to wait after a 429: Retry-After, else Mapbox's reset time, else backoff."""
+    try:
+        return float(resp.headers["Retry-After"])
+    except (KeyError, ValueError):
+        pass
+    try:
+        return max(0.0, float(resp.headers["X-Rate-Limit-Reset"]) - time.time())
+    except (KeyError, ValueError):
+        return 0.5 * 2 ** attempt + random.random()
+
+
+async def mapbox_get(url: str, **kwargs) -> httpx.Response:
+    """GET a Mapbox URL on the shared client, rate limited and retried on 429."""
+    client = get_client()
+    for attempt in range(MAPBOX_MAX_ATTEMPTS):
+        async with _limiter:
+            resp = await client.get(url, **kwargs)
+        if resp.status_code != 429 or attempt == MAPBOX_MAX_ATTEMPTS - 1:
+            return resp
+        delay = _retry_delay(resp, attempt)
+        logger.warning(f"Mapbox rate limited (429), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+# ── Mapbox response models ────────────────────────────────────
+# Only the fields the formatters read; everything else is skipped while parsing.
+# Defaults mirror the old .get() fallbacks. The adapter validates the raw
+# response bytes in pydantic-core, with no intermediate dict tree.
+class MapboxContext(BaseModel):
+    id: str = ""
+    text: str = ""
+
+
+class MapboxProperties(BaseModel):
+    category: Optional[str] = None
+
+
+class MapboxFeature(BaseModel):
+    id: str = ""
+    text: str = "Unknown"
+    place_name: str = ""
+    center: list[float] = [0, 0]
+    properties: MapboxProperties = MapboxProperties()
+    context: list[MapboxContext] = []
+
+
+class MapboxFeatureCollection(BaseModel):
+    features: list[MapboxFeature] = []
+
+
+_features_adapter = TypeAdapter(MapboxFeatureCollection)
+
+
+def parse_features(content: bytes) -> list[MapboxFeature]:
+    """Parse a Mapbox geocoding response body into its features."""
+    return _features_adapter.validate_json(content).features
+
 
 def _get_mapbox_token() -> Optional[str]:
     return os.getenv("MAPBOX_ACCESS_TOKEN") or os.getenv("VITE_MAPBOX_ACCESS_TOKEN")
@@ -38,6 +163,8 @@ async def search_places(
     limit: int = 5,
     radius: int = 10000,
     sort: str = "RELEVANCE",
+    near_lat: Optional[float] = None,
+    near_lng: Optional[float] = None,
 ) -> list[dict]:
     """
     Search for places using Mapbox Geocoding API.
@@ -48,6 +175,8 @@ async def search_places(
         categories: Category key from CATEGORY_MAP (e.g. "hotels")
         limit: Max results (1-10)
         radius: Not used directly by Mapbox, but affects proximity bias
+        near_lat, near_lng: Coordinates for the proximity bias when the caller
+            already has them — skips geocoding `near`
 
     Returns:
         List of venue dicts with name, address, coordinates, etc.
@@ -62,7 +191,9 @@ async def search_places(
 
     # First geocode the "near" location to get a proximity bias
     proximity = None
-    if near:
+    if near_lat is not None and near_lng is not None:
+        proximity = {"lat": near_lat, "lng": near_lng}
+    elif near:
         geo = await _geocode_location(near, token)
         if geo:
             proximity = geo
@@ -78,67 +209,70 @@ async def search_places(
 
     url = f"{MAPBOX_BASE}/{search_text}.json"
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            features = data.get("features", [])
-            logger.info(f"Mapbox POI returned {len(features)} results for '{search_text}' near '{near}'")
-            return _format_results(features)
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Mapbox POI error {e.response.status_code}: {e.response.text[:200]}")
-            return []
-        except Exception as e:
-            logger.error(f"Mapbox POI request failed: {e}")
-            return []
+    try:
+        resp = await mapbox_get(url, params=params)
+        resp.raise_for_status()
+        features = parse_features(resp.content)
+        logger.info(f"Mapbox POI returned {len(features)} results for '{search_text}' near '{near}'")
+        return _format_results(features)
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Mapbox POI error {e.response.status_code}: {e.response.text[:200]}")
+        return []
+    except Exception as e:
+        logger.error(f"Mapbox POI request failed: {e}")
+        return []
 
 
 async def _geocode_location(place: str, token: str) -> Optional[dict]:
-    """Quick geocode to get lat/lng for proximity bias."""
+    """Quick geocode to get lat/lng for proximity bias (cached, see _geo_cache)."""
+    return await _geo_cache.cached(
+        f"near:{_geo_cache.normalize(place)}", lambda: _fetch_location(place, token)
+    )
+
+
+async def _fetch_location(place: str, token: str) -> Optional[dict]:
     url = f"{MAPBOX_BASE}/{place}.json"
     params = {"access_token": token, "limit": "1", "types": "place,locality,region"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            features = data.get("features", [])
-            if features:
-                lng, lat = features[0]["center"]
-                return {"lat": lat, "lng": lng}
-            return None
-        except Exception:
-            return None
-
-
-def _format_results(features: list[dict]) -> list[dict]:
+    try:
+        resp = await mapbox_get(url, params=params, timeout=10.0)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        features = data.get("features", [])
+        if features:
+            lng, lat = features[0]["center"]
+            return {"lat": lat, "lng": lng}
+        return None
+    except Exception:
+        return None
+
+
+def _format_results(features: list[MapboxFeature]) -> list[dict]:
     """Format Mapbox geocoding features into a cleaner venue structure."""
     formatted = []
     for f in features:
-        props = f.get("properties", {})
-        context = f.get("context", [])
-        center = f.get("center", [0, 0])
+        center = f.center
 
         # Extract locality from context
         locality = ""
         region = ""
-        for ctx in context:
-            ctx_id = ctx.get("id", "")
-            if ctx_id.startswith("place"):
-                locality = ctx.get("text", "")
-            elif ctx_id.startswith("region"):
-                region = ctx.get("text", "")
+        for ctx in f.context:
+            if ctx.id.startswith("place"):
+                locality = ctx.text
+            elif ctx.id.startswith("region"):
+                region = ctx.text
 
         # Determine category from Mapbox POI category array
-        categories = props.get("category", "").split(", ") if props.get("category") else []
-        primary_cat = categories[0] if categories else f.get("text", "Place")
+        category = f.properties.category
+        if category:
+            primary_cat = category.split(", ")[0]
+        else:
+            primary_cat = f.text if "text" in f.model_fields_set else "Place"
 
         formatted.append({
-            "fsq_id": f.get("id", ""),  # keep same key name for frontend compat
-            "name": f.get("text", "Unknown"),
-            "address": f.get("place_name", ""),
+            "fsq_id": f.id,  # keep same key name for frontend compat
+            "name": f.text,
+            "address": f.place_name,
             "locality": locality,
             "region": region,
             "country": "",
@@ -159,9 +293,14 @@ def _format_results(features: list[dict]) -> list[dict]:
 
 def resolve_categories(category_names: list[str]) -> str:
     """Convert human-readable category names to search queries."""
+    return _resolve_categories(tuple(category_names))
+
+
+@lru_cache(maxsize=64)
+def _resolve_categories(category_names: tuple[str, ...]) -> str:
     queries = []
     for name in category_names:
-        q = CATEGORY_MAP.get(name.lower().strip())
+        q = CATEGORY_MAP_LOWER.get(name.lower().strip())
         if q:
             queries.append(q)
     return ",".join(queries)
@@ -8,25 +8,58 @@ Route-based venue discovery.
 5. Deduplicates and returns venues with route position info
 """
 
+import asyncio
 import logging
 import math
 import os
-from typing import Optional
+from typing import Callable, Optional, Union
+from urllib.parse import quote
 import httpx
+import numpy as np
+import orjson
+import polyline
+from rapidfuzz import fuzz, process, utils
 
-from services.foursquare import search_places, CATEGORY_MAP
+from services import _geo_cache
+from services.foursquare import search_places, mapbox_get, parse_features, CATEGORY_PRIMARY
 
 logger = logging.getLogger(__name__)
 
 MAPBOX_BASE = "https://api.mapbox.com"
 
+# Max POI searches in flight at once (the request rate itself is paced by
+# the Mapbox limiter in mapbox_get)
+POI_CONCURRENCY = 8
+_poi_semaphore = asyncio.Semaphore(POI_CONCURRENCY)
+
+# Most points searched along one route — bounds a long route's fan-out to
+# MAX_ROUTE_POINTS × categories Mapbox calls whatever its length
+MAX_ROUTE_POINTS = int(os.getenv("MAX_ROUTE_POINTS", "12"))
+
+# Same venue under a slightly different name from a nearby point
+# ("ITC Grand Chola" vs "ITC Grand Chola Hotel"): name similarity ≥ cutoff
+# and within DUPLICATE_MAX_KM of each other
+DUPLICATE_NAME_CUTOFF = 90
+DUPLICATE_MAX_KM = 0.5
+
+# Batch geocoding needs the mapbox.places-permanent endpoint, which not every
+# token has access to — opt in with MAPBOX_PERMANENT_GEOCODING=1. A 401/403
+# from it switches batching off for the rest of the process.
+_permanent_geocoding = os.getenv("MAPBOX_PERMANENT_GEOCODING") == "1"
+
 
 def _get_mapbox_token() -> Optional[str]:
     return os.getenv("MAPBOX_ACCESS_TOKEN") or os.getenv("VITE_MAPBOX_ACCESS_TOKEN")
 
 
 async def geocode_place(place: str) -> Optional[dict]:
-    """Geocode a place name to lat/lng using Mapbox."""
+    """Geocode a place name to lat/lng using Mapbox (cached, see _geo_cache)."""
+    return await _geo_cache.cached(
+        f"place:{_geo_cache.normalize(place)}", lambda: _fetch_place(place)
+    )
+
+
+async def _fetch_place(place: str) -> Optional[dict]:
     token = _get_mapbox_token()
     if not token:
         logger.error("No Mapbox token configured")
@@ -35,50 +68,120 @@ async def geocode_place(place: str) -> Optional[dict]:
     url = f"{MAPBOX_BASE}/geocoding/v5/mapbox.places/{place}.json"
     params = {"access_token": token, "limit": "1", "types": "place,region,country,locality"}
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            features = data.get("features", [])
-            if features:
-                lng, lat = features[0]["center"]
-                return {"lat": lat, "lng": lng, "name": features[0].get("place_name", place)}
-            return None
-        except Exception as e:
-            logger.error(f"Geocoding failed for '{place}': {e}")
+    try:
+        resp = await mapbox_get(url, params=params, timeout=10.0)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        features = data.get("features", [])
+        if features:
+            lng, lat = features[0]["center"]
+            return {"lat": lat, "lng": lng, "name": features[0].get("place_name", place)}
+        return None
+    except Exception as e:
+        logger.error(f"Geocoding failed for '{place}': {e}")
+        return None
+
+
+async def batch_geocode(places: list[str]) -> list[Optional[dict]]:
+    """
+    Geocode several places, index-aligned with the input. With permanent
+    geocoding enabled, uncached places go out in one batch request to the
+    mapbox.places-permanent endpoint (semicolon-separated queries); otherwise,
+    or if that fails, each falls back to geocode_place.
+    """
+    keys = [f"place:{_geo_cache.normalize(p)}" for p in places]
+    results = [_geo_cache.get(k) for k in keys]
+    missing = [i for i, r in enumerate(results) if r is None]
+
+    if len(missing) > 1 and _permanent_geocoding:
+        fetched = await _fetch_places_batch([places[i] for i in missing])
+        if fetched is not None:
+            for i, geo in zip(missing, fetched):
+                results[i] = geo
+                if geo is not None:
+                    _geo_cache.put(keys[i], geo)
+            return results
+
+    if missing:
+        singles = await asyncio.gather(*[geocode_place(places[i]) for i in missing])
+        for i, geo in zip(missing, singles):
+            results[i] = geo
+    return results
+
+
+async def _fetch_places_batch(places: list[str]) -> Optional[list[Optional[dict]]]:
+    """One batch geocoding request; None if the batch endpoint can't be used."""
+    global _permanent_geocoding
+    token = _get_mapbox_token()
+    if not token:
+        return None
+
+    path = ";".join(quote(p, safe="") for p in places)
+    url = f"{MAPBOX_BASE}/geocoding/v5/mapbox.places-permanent/{path}.json"
+    params = {"access_token": token, "limit": "1", "types": "place,region,country,locality"}
+
+    try:
+        resp = await mapbox_get(url, params=params, timeout=10.0)
+        if resp.status_code in (401, 403):
+            _permanent_geocoding = False
+            logger.warning("Mapbox token has no permanent geocoding access — batch geocoding disabled")
             return None
+        resp.raise_for_status()
+        collections = orjson.loads(resp.content)
+        if not isinstance(collections, list) or len(collections) != len(places):
+            raise ValueError("unexpected batch response shape")
+    except Exception as e:
+        logger.warning(f"Batch geocoding unavailable ({e}) — geocoding one by one")
+        return None
+
+    out: list[Optional[dict]] = []
+    for place, fc in zip(places, collections):
+        features = fc.get("features", [])
+        if features:
+            lng, lat = features[0]["center"]
+            out.append({"lat": lat, "lng": lng, "name": features[0].get("place_name", place)})
+        else:
+            out.append(None)
+    return out
 
 
 async def get_route(origin_lng: float, origin_lat: float, dest_lng: float, dest_lat: float) -> Optional[list]:
-    """Get driving route coordinates from Mapbox Directions API."""
+    """Get driving route coordinates from Mapbox Directions API (cached, see _geo_cache)."""
+    return await _geo_cache.cached(
+        _geo_cache.route_key(origin_lng, origin_lat, dest_lng, dest_lat),
+        lambda: _fetch_route(origin_lng, origin_lat, dest_lng, dest_lat),
+    )
+
+
+async def _fetch_route(origin_lng: float, origin_lat: float, dest_lng: float, dest_lat: float) -> Optional[list]:
     token = _get_mapbox_token()
     if not token:
         return None
 
     url = f"{MAPBOX_BASE}/directions/v5/mapbox/driving/{origin_lng},{origin_lat};{dest_lng},{dest_lat}"
+    # polyline6: the full-overview geometry as one encoded string, several
+    # times smaller to transfer and parse than a GeoJSON coordinate array
     params = {
         "access_token": token,
-        "geometries": "geojson",
+        "geometries": "polyline6",
         "overview": "full",
     }
 
-    async with httpx.AsyncClient(timeout=15.0) as client:
-        try:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            routes = data.get("routes", [])
-            if routes:
-                coords = routes[0]["geometry"]["coordinates"]  # [[lng, lat], ...]
-                distance_km = routes[0]["distance"] / 1000
-                duration_min = routes[0]["duration"] / 60
-                logger.info(f"Route: {distance_km:.0f} km, {duration_min:.0f} min, {len(coords)} points")
-                return coords
-            return None
-        except Exception as e:
-            logger.error(f"Directions API failed: {e}")
-            return None
+    try:
+        resp = await mapbox_get(url, params=params)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        routes = data.get("routes", [])
+        if routes:
+            coords = polyline.decode(routes[0]["geometry"], 6, geojson=True)  # [(lng, lat), ...]
+            distance_km = routes[0]["distance"] / 1000
+            duration_min = routes[0]["duration"] / 60
+            logger.info(f"Route: {distance_km:.0f} km, {duration_min:.0f} min, {len(coords)} points")
+            return coords
+        return None
+    except Exception as e:
+        logger.error(f"Directions API failed: {e}")
+        return None
 
 
 def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
@@ -90,35 +193,113 @@ def _haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
     return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
 
 
-def sample_points_along_route(coords: list, interval_km: float = 50.0) -> list[dict]:
+def _segment_km(coords) -> np.ndarray:
+    """
+    Length of each segment of a [[lng, lat], ...] polyline, in one vectorized
+    pass. Directions segments are mostly under 100 m, where the equirectangular
+    approximation matches haversine to well under a metre with one cos and
+    one sqrt instead of six transcendentals.
+    """
+    arr = np.radians(np.asarray(coords, dtype=np.float64))
+    lng, lat = arr[:, 0], arr[:, 1]
+    x = np.diff(lng) * np.cos((lat[:-1] + lat[1:]) / 2)
+    y = np.diff(lat)
+    return 6371 * np.sqrt(x * x + y * y)
+
+
+def sample_points_along_route(
+    coords: list,
+    interval_km: Union[float, Callable[[float], float]] = 50.0,
+) -> tuple[list[dict], float]:
     """
     Sample points along a route polyline at regular intervals.
-    Returns list of {lat, lng, distance_km} dicts.
+    interval_km may also be a function of the total route length, so callers
+    can size the interval without measuring the route a second time.
+    Returns ([{lat, lng, distance_km}, ...], total route length in km).
     """
     if not coords or len(coords) < 2:
-        return []
+        return [], 0.0
 
-    points = []
-    accumulated_km = 0.0
+    cumul = np.cumsum(_segment_km(coords))  # cumul[i] = km from start to coords[i + 1]
+    total_km = float(cumul[-1])
+    if callable(interval_km):
+        interval_km = interval_km(total_km)
+    if interval_km <= 0:
+        raise ValueError(f"interval_km must be positive, got {interval_km}")
 
     # Always include the start
-    points.append({"lat": coords[0][1], "lng": coords[0][0], "distance_km": 0})
+    points = [{"lat": coords[0][1], "lng": coords[0][0], "distance_km": 0}]
 
-    for i in range(1, len(coords)):
-        prev_lng, prev_lat = coords[i - 1]
-        curr_lng, curr_lat = coords[i]
-        segment_km = _haversine_km(prev_lat, prev_lng, curr_lat, curr_lng)
-        accumulated_km += segment_km
-
-        if accumulated_km >= interval_km * len(points):
-            points.append({"lat": curr_lat, "lng": curr_lng, "distance_km": round(accumulated_km, 1)})
+    # First coordinate at or past each interval mark. A segment that spans
+    # several marks yields a single point.
+    marks = np.arange(1, int(total_km // interval_km) + 1) * interval_km
+    for i in np.unique(np.searchsorted(cumul, marks, side="left")):
+        lng, lat = coords[i + 1]
+        points.append({"lat": lat, "lng": lng, "distance_km": round(float(cumul[i]), 1)})
 
     # Always include the end
     end_lat, end_lng = coords[-1][1], coords[-1][0]
     if len(points) < 2 or _haversine_km(points[-1]["lat"], points[-1]["lng"], end_lat, end_lng) > 5:
-        points.append({"lat": end_lat, "lng": end_lng, "distance_km": round(accumulated_km, 1)})
+        points.append({"lat": end_lat, "lng": end_lng, "distance_km": round(total_km, 1)})
+
+    return points, total_km
 
-    return points
+
+def _sample_interval(total_km: float, interval_km: float) -> float:
+    """Sampling interval for a route: denser on short routes, at most ~5 points on long ones."""
+    if total_km < 50:
+        return max(10, total_km / 3)
+    if total_km < 200:
+        return 40
+    return min(interval_km, total_km / 5)
+
+
+def thin_points(points: list[dict], min_gap_km: float) -> list[dict]:
+    """
+    Greedily drop sample points closer than min_gap_km to the last kept one
+    (or to the route end), since nearby proximity searches return mostly the
+    same POIs. The start and end points are always kept.
+    """
+    if len(points) <= 2:
+        return points
+    end = points[-1]
+    kept = [points[0]]
+    for pt in points[1:-1]:
+        last = kept[-1]
+        if (
+            _haversine_km(last["lat"], last["lng"], pt["lat"], pt["lng"]) >= min_gap_km
+            and _haversine_km(pt["lat"], pt["lng"], end["lat"], end["lng"]) >= min_gap_km
+        ):
+            kept.append(pt)
+    kept.append(end)
+    return kept
+
+
+def dedupe_similar_venues(venues: list[dict]) -> list[dict]:
+    """
+    Drop venues whose name closely matches an earlier venue's and that lie
+    within DUPLICATE_MAX_KM of it, keeping the first occurrence. All name
+    pairs are scored in a single rapidfuzz cdist call.
+    """
+    if len(venues) < 2:
+        return venues
+    names = [v["name"] for v in venues]
+    scores = process.cdist(
+        names, names,
+        scorer=fuzz.token_set_ratio, processor=utils.default_process,
+        score_cutoff=DUPLICATE_NAME_CUTOFF, dtype=np.uint8, workers=-1,
+    )
+    keep = [True] * len(venues)
+    # Row-major (i < j) order: keep[i] is final by the time row i is reached
+    for i, j in np.argwhere(np.triu(scores >= DUPLICATE_NAME_CUTOFF, 1)):
+        if not keep[i] or not keep[j]:
+            continue
+        a, b = venues[i], venues[j]
+        if None in (a["latitude"], a["longitude"], b["latitude"], b["longitude"]):
+            continue
+        if _haversine_km(a["latitude"], a["longitude"], b["latitude"], b["longitude"]) < DUPLICATE_MAX_KM:
+            keep[j] = False
+    return [v for v, k in zip(venues, keep) if k]
 
 
 async def search_venues_along_route(
@@ -133,8 +314,7 @@ async def search_venues_along_route(
     Returns venues grouped by category with route position info.
     """
     # Step 1: Geocode source and destination
-    src_geo = await geocode_place(source)
-    dst_geo = await geocode_place(destination)
+    src_geo, dst_geo = await batch_geocode([source, destination])
 
     if not src_geo:
         logger.error(f"Could not geocode source: {source}")
@@ -151,46 +331,53 @@ async def search_venues_along_route(
         logger.warning("No route found, falling back to endpoint-only search")
         route_coords = [[src_geo["lng"], src_geo["lat"]], [dst_geo["lng"], dst_geo["lat"]]]
 
-    # Step 3: Sample points along the route
-    total_distance = sum(
-        _haversine_km(route_coords[i][1], route_coords[i][0], route_coords[i + 1][1], route_coords[i + 1][0])
-        for i in range(len(route_coords) - 1)
+    # Step 3: Sample points along the route (interval adjusted to total distance)
+    sampled, total_distance = sample_points_along_route(
+        route_coords, lambda total_km: _sample_interval(total_km, interval_km)
     )
-
-    # Adjust interval based on total distance
-    if total_distance < 50:
-        sample_interval = max(10, total_distance / 3)
-    elif total_distance < 200:
-        sample_interval = 40
-    else:
-        sample_interval = min(interval_km, total_distance / 5)
-
-    sampled = sample_points_along_route(route_coords, sample_interval)
+    sample_interval = _sample_interval(total_distance, interval_km)
+    # Winding roads can put consecutive samples close together as the crow flies
+    sampled = thin_points(sampled, max(sample_interval * 0.6, 15))
+    if len(sampled) > MAX_ROUTE_POINTS:
+        # Evenly spaced subset; linspace keeps both the start and the end
+        keep = np.linspace(0, len(sampled) - 1, MAX_ROUTE_POINTS).astype(int)
+        sampled = [sampled[i] for i in keep]
     logger.info(f"Route {total_distance:.0f} km — sampled {len(sampled)} points at {sample_interval:.0f} km intervals")
 
     # Step 4: Search Foursquare at each sampled point
     all_results: dict[str, list[dict]] = {cat: [] for cat in categories}
     seen_ids: set[str] = set()
 
-    for cat_name in categories:
-        cat_id = CATEGORY_MAP.get(cat_name.lower())
-        if not cat_id:
-            continue
-
-        for pt in sampled:
-            venues = await _search_at_point(
+    # All (category, point) searches run concurrently (bounded by _poi_semaphore)
+    queries = {c: CATEGORY_PRIMARY.get(c.lower()) for c in categories}
+    jobs = [(cat_name, pt) for cat_name in categories if queries[cat_name] for pt in sampled]
+    results = await asyncio.gather(
+        *[
+            _search_at_point(
                 lat=pt["lat"], lng=pt["lng"],
-                category_id=cat_id,
+                search_query=queries[cat_name],
                 limit=limit_per_point,
                 distance_km=pt["distance_km"],
             )
+            for cat_name, pt in jobs
+        ],
+        return_exceptions=True,
+    )
+
+    # Merge in the original category/point order so dedup keeps the same venue
+    for (cat_name, pt), venues in zip(jobs, results):
+        if isinstance(venues, Exception):
+            logger.error(f"POI search failed at ({pt['lat']},{pt['lng']}): {venues}")
+            continue
+        for v in venues:
+            vid = v.get("fsq_id", v["name"])
+            if vid not in seen_ids:
+                seen_ids.add(vid)
+                v["route_distance_km"] = pt["distance_km"]
+                all_results[cat_name].append(v)
 
-            for v in venues:
-                vid = v.get("fsq_id", v["name"])
-                if vid not in seen_ids:
-                    seen_ids.add(vid)
-                    v["route_distance_km"] = pt["distance_km"]
-                    all_results[cat_name].append(v)
+    # Ids differ for the same venue seen from different points — match by name + distance
+    all_results = {cat: dedupe_similar_venues(venues) for cat, venues in all_results.items()}
 
     total = sum(len(v) for v in all_results.values())
     return {
@@ -203,17 +390,22 @@ async def search_venues_along_route(
     }
 
 
-async def _search_at_point(lat: float, lng: float, category_id: str, limit: int, distance_km: float) -> list[dict]:
+async def _search_at_point(lat: float, lng: float, search_query: str, limit: int, distance_km: float) -> list[dict]:
     """Search for POIs near a specific lat/lng using Mapbox Geocoding API."""
+    venues = await _geo_cache.cached(
+        _geo_cache.point_key(lat, lng, search_query, limit),
+        lambda: _fetch_point(lat, lng, search_query, limit),
+        cacheable=bool,  # an empty list may be a failed request — retry next time
+    )
+    # Copies: callers annotate venues with route info, the cache must stay clean
+    return [dict(v) for v in venues]
+
+
+async def _fetch_point(lat: float, lng: float, search_query: str, limit: int) -> list[dict]:
     token = _get_mapbox_token()
     if not token:
         return []
 
-    # category_id here is actually the search query from CATEGORY_MAP (e.g. "hotel,resort,lodge")
-    # Use the first term for the geocoding search
-    search_terms = category_id.split(",")
-    search_query = search_terms[0].strip()
-
     url = f"{MAPBOX_BASE}/geocoding/v5/mapbox.places/{search_query}.json"
     params = {
         "access_token": token,
@@ -223,27 +415,25 @@ async def _search_at_point(lat: float, lng: float, category_id: str, limit: int,
         "language": "en",
     }
 
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    async with _poi_semaphore:
         try:
-            resp = await client.get(url, params=params)
+            resp = await mapbox_get(url, params=params, timeout=10.0)
             resp.raise_for_status()
-            data = resp.json()
-            features = data.get("features", [])
+            features = parse_features(resp.content)
 
             formatted = []
             for f in features:
-                center = f.get("center", [0, 0])
-                props = f.get("properties", {})
-                categories = props.get("category", "").split(", ") if props.get("category") else []
+                center = f.center
+                category = f.properties.category
 
                 formatted.append({
-                    "fsq_id": f.get("id", ""),
-                    "name": f.get("text", "Unknown"),
-                    "address": f.get("place_name", ""),
+                    "fsq_id": f.id,
+                    "name": f.text,
+                    "address": f.place_name,
                     "locality": "",
                     "latitude": center[1] if len(center) > 1 else None,
                     "longitude": center[0] if len(center) > 0 else None,
-                    "category": categories[0] if categories else search_query.title(),
+                    "category": category.split(", ")[0] if category else search_query.title(),
                     "rating": None,
                     "price": None,
                     "tip": None,
@@ -0,0 +1,113 @@
+"""
+Numba kernels for the activity scorers.
+
+The walkability cascade is plain float/int math once venue types are
+encoded as integers, so it compiles to a tight loop over the batch instead
+of one interpreted call per activity.
+"""
+
+import numpy as np
+from numba import njit, prange
+
+# Venue-type effort classes passed to the kernels (see elderly_scorer._effort_id)
+EFFORT_NONE = 0
+EFFORT_HIGH = 1
+EFFORT_LOW = 2
+
+
+@njit(cache=True)
+def _walk_kernel(
+    distance_km: float,
+    steps: int,
+    is_outdoor: bool,
+    duration: int,
+    effort_id: int,
+    effort_hits: int,
+) -> float:
+    """Walkability score for one activity — see compute_walkability_score."""
+    score = 70.0
+
+    # ── Distance-based penalties ──
+    if distance_km > 5:
+        score -= 35
+    elif distance_km > 3:
+        score -= 25
+    elif distance_km > 2:
+        score -= 15
+    elif distance_km > 1:
+        score -= 8
+
+    # ── Steps-based penalties ──
+    if steps > 8000:
+        score -= 35
+    elif steps > 5000:
+        score -= 20
+    elif steps > 3000:
+        score -= 10
+    elif steps > 1500:
+        score -= 5
+
+    # ── Indoor vs outdoor ──
+    if is_outdoor:
+        score -= 10
+
+    # ── Duration penalty ──
+    if duration > 180:
+        score -= 20
+    elif duration > 120:
+        score -= 12
+    elif duration > 60:
+        score -= 5
+
+    # ── Type-based adjustments ──
+    if effort_id == EFFORT_HIGH:
+        score -= 25
+    elif effort_id == EFFORT_LOW:
+        score += 15
+
+    # ── Description keyword hits ──
+    score -= effort_hits * 8
+
+    return min(max(score, 0.0), 100.0)
+
+
+# Below this many rows, thread-pool startup outweighs the parallel speedup
+PARALLEL_MIN_ROWS = 32
+
+
+@njit(cache=True)
+def _walk_scores_serial(distance_km, steps, is_outdoor, duration, effort_id, effort_hits):
+    n = distance_km.shape[0]
+    out = np.empty(n, np.float64)
+    for i in range(n):
+        out[i] = _walk_kernel(
+            distance_km[i], steps[i], is_outdoor[i], duration[i], effort_id[i], effort_hits[i]
+        )
+    return out
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def _walk_scores_parallel(distance_km, steps, is_outdoor, duration, effort_id, effort_hits):
+    n = distance_km.shape[0]
+    out = np.empty(n, np.float64)
+    for i in prange(n):
+        out[i] = _walk_kernel(
+            distance_km[i], steps[i], is_outdoor[i], duration[i], effort_id[i], effort_hits[i]
+        )
+    return out
+
+
+def walk_scores(
+    distance_km: np.ndarray,
+    steps: np.ndarray,
+    is_outdoor: np.ndarray,
+    duration: np.ndarray,
+    effort_id: np.ndarray,
+    effort_hits: np.ndarray,
+) -> np.ndarray:
+    """
+    _walk_kernel over a batch of activities. Rows are split across numba's
+    thread pool (GIL released) once the batch is big enough to pay for it.
+    """
+    kernel = _walk_scores_parallel if len(distance_km) >= PARALLEL_MIN_ROWS else _walk_scores_serial
+    return kernel(distance_km, steps, is_outdoor, duration, effort_id, effort_hits)
@@ -0,0 +1,58 @@
+"""
+Small in-process LRU cache with a per-entry time-to-live.
+
+Used as a first-level cache in front of slow upstream calls (BestTime
+searches and forecasts). Entries expire after `ttl` seconds and the least
+recently used entry is evicted once `maxsize` is reached. Not thread-safe —
+meant to be used from a single event loop.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.time() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def snapshot(self) -> list[tuple[Hashable, float, Any]]:
+        """Unexpired entries as (key, expires_at, value), oldest first."""
+        now = time.time()
+        return [(k, exp, v) for k, (exp, v) in self._data.items() if exp > now]
+
+    def restore(self, entries: list[tuple[Hashable, float, Any]]) -> None:
+        """Load entries produced by snapshot(), keeping their original expiry."""
+        now = time.time()
+        for key, expires_at, value in entries:
+            if expires_at > now:
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
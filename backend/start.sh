@@ -0,0 +1,22 @@
+#!/usr/bin/env sh
+# Production entrypoint — runs the FastAPI app under gunicorn with uvicorn
+# worker processes, 2×cores+1 workers by default.
+# Override the worker count with WEB_CONCURRENCY and the port with PORT.
+set -e
+
+cd "$(dirname "$0")"
+
+# nproc is GNU-only; getconf covers Linux and macOS, sysctl older BSDs
+CORES="$(getconf _NPROCESSORS_ONLN 2>/dev/null || sysctl -n hw.ncpu)"
+WORKERS="${WEB_CONCURRENCY:-$((2 * CORES + 1))}"
+# Workers read this to split per-process budgets (e.g. the Mapbox rate limit)
+export WEB_CONCURRENCY="$WORKERS"
+# Split the cores between the workers' numba thread pools rather than giving
+# every worker one thread per core (at least one thread each)
+THREADS=$((CORES / WORKERS))
+export NUMBA_NUM_THREADS="${NUMBA_NUM_THREADS:-$((THREADS > 0 ? THREADS : 1))}"
+
+exec gunicorn main:app \
+    -k uvicorn.workers.UvicornWorker \
+    -w "$WORKERS" \
+    --bind "0.0.0.0:${PORT:-8000}"
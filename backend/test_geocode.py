@@ -1,7 +1,13 @@
-import urllib.request
-import json
+import asyncio
+import os
+from urllib.parse import quote
 
-token = "pk.eyJ1Ijoic2lkZGhhcnRoeDE3IiwiYSI6ImNtbHZ5NHd3NDA2cWEzZnF3MDh6cGtlZncifQ.k_80H99AtOTAyyqDTD4u1w"
+import httpx
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+token = os.getenv("MAPBOX_ACCESS_TOKEN") or os.getenv("VITE_MAPBOX_ACCESS_TOKEN")
 
 # Mumbai as destination
 dest_lat, dest_lng = 19.0760, 72.8777
@@ -17,23 +23,49 @@ test_locations = [
 
 bbox = f"{dest_lng - 1},{dest_lat - 1},{dest_lng + 1},{dest_lat + 1}"
 
-print(f"Destination: Mumbai ({dest_lat}, {dest_lng})")
-print(f"Bounding box: {bbox}")
-print("-" * 60)
-
-for loc in test_locations:
-    query = f"{loc}, Mumbai"
-    encoded = urllib.request.quote(query)
-    url = f"https://api.mapbox.com/geocoding/v5/mapbox.places/{encoded}.json?access_token={token}&limit=1&bbox={bbox}&proximity={dest_lng},{dest_lat}"
-    
-    try:
-        resp = urllib.request.urlopen(url)
-        data = json.loads(resp.read())
-        if data["features"]:
-            f = data["features"][0]
-            coords = f["center"]
-            print(f"OK  '{loc}' -> [{coords[1]:.4f}, {coords[0]:.4f}] ({f['place_name'][:60]})")
-        else:
-            print(f"MISS '{loc}' -> no results in bbox")
-    except Exception as e:
-        print(f"ERR  '{loc}' -> {e}")
+
+async def main():
+    if not token:
+        raise SystemExit("MAPBOX_ACCESS_TOKEN not set (see backend/.env)")
+
+    print(f"Destination: Mumbai ({dest_lat}, {dest_lng})")
+    print(f"Bounding box: {bbox}")
+    print("-" * 60)
+
+    params = {
+        "access_token": token,
+        "limit": "1",
+        "bbox": bbox,
+        "proximity": f"{dest_lng},{dest_lat}",
+    }
+    # All lookups in flight at once over one client
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        results = await asyncio.gather(
+            *[
+                client.get(
+                    f"https://api.mapbox.com/geocoding/v5/mapbox.places/{quote(f'{loc}, Mumbai')}.json",
+                    params=params,
+                )
+                for loc in test_locations
+            ],
+            return_exceptions=True,
+        )
+
+    for loc, resp in zip(test_locations, results):
+        try:
+            if isinstance(resp, Exception):
+                raise resp
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            if data["features"]:
+                f = data["features"][0]
+                coords = f["center"]
+                print(f"OK  '{loc}' -> [{coords[1]:.4f}, {coords[0]:.4f}] ({f['place_name'][:60]})")
+            else:
+                print(f"MISS '{loc}' -> no results in bbox")
+        except Exception as e:
+            print(f"ERR  '{loc}' -> {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,50 @@
+"""batch_geocode: the permanent batch endpoint is opt-in and dropped after a 401/403."""
+
+import asyncio
+
+import httpx
+import orjson
+
+from services import route_venues
+
+
+def _feature_collection(name: str) -> dict:
+    return {"features": [{"center": [80.27, 13.08], "place_name": name}]}
+
+
+def _stub_mapbox(urls: list[str]):
+    async def mapbox_get(url, **kwargs):
+        urls.append(url)
+        request = httpx.Request("GET", url)
+        if "places-permanent" in url:
+            return httpx.Response(403, request=request)
+        return httpx.Response(200, content=orjson.dumps(_feature_collection("Chennai")), request=request)
+    return mapbox_get
+
+
+def test_forbidden_batch_disables_permanent_geocoding(monkeypatch):
+    urls: list[str] = []
+    monkeypatch.setenv("MAPBOX_ACCESS_TOKEN", "pk.test")
+    monkeypatch.setattr(route_venues, "mapbox_get", _stub_mapbox(urls))
+    monkeypatch.setattr(route_venues, "_permanent_geocoding", True)
+
+    first = asyncio.run(route_venues.batch_geocode(["Batchtest A", "Batchtest B"]))
+    assert [g["lat"] for g in first] == [13.08, 13.08]
+    assert sum("places-permanent" in u for u in urls) == 1
+    assert route_venues._permanent_geocoding is False
+
+    urls.clear()
+    asyncio.run(route_venues.batch_geocode(["Batchtest C", "Batchtest D"]))
+    assert len(urls) == 2
+    assert not any("places-permanent" in u for u in urls)
+
+
+def test_batch_endpoint_is_opt_in(monkeypatch):
+    urls: list[str] = []
+    monkeypatch.setenv("MAPBOX_ACCESS_TOKEN", "pk.test")
+    monkeypatch.setattr(route_venues, "mapbox_get", _stub_mapbox(urls))
+    monkeypatch.setattr(route_venues, "_permanent_geocoding", False)
+
+    asyncio.run(route_venues.batch_geocode(["Batchtest E", "Batchtest F"]))
+    assert len(urls) == 2
+    assert not any("places-permanent" in u for u in urls)
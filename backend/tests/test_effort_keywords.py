@@ -0,0 +1,37 @@
+"""High-effort keyword hits in activity descriptions (substring + fuzzy)."""
+
+import pytest
+
+from services.elderly_scorer import _effort_hits, _effort_hits_batch, score_venue_for_elderly
+
+
+@pytest.mark.parametrize("description", [
+    "a quiet spot to sit",
+    "5 stars hotel",
+    "port and sort",
+    "the best spots in town",
+])
+def test_short_words_are_not_fuzzy_hits(description):
+    # "spot"/"port"/"sort" are within fuzz.ratio 85 of "sport", "stars" of "stairs"
+    assert _effort_hits(description) == 0
+
+
+@pytest.mark.parametrize("description, hits", [
+    ("hikes and treks", 2),      # plurals: substring hits
+    ("climb the stairrs", 2),    # misspelt long keyword: fuzzy hit
+    ("cyclling tour", 1),
+    ("stairs stairs stairs", 1), # distinct keywords, not occurrences
+])
+def test_effort_hits(description, hits):
+    assert _effort_hits(description) == hits
+
+
+def test_batch_matches_scalar():
+    descriptions = ["a quiet spot to sit", None, "", "climb the stairrs", "5 stars hotel", "uphill trek"]
+    assert list(_effort_hits_batch(descriptions)) == [_effort_hits(d) for d in descriptions]
+
+
+@pytest.mark.parametrize("description", ["a quiet spot to sit", "5 stars hotel"])
+def test_harmless_description_does_not_change_score(description):
+    kwargs = dict(name="Seafront bench", busyness_pct=20, duration_minutes=30)
+    assert score_venue_for_elderly(description=description, **kwargs) == score_venue_for_elderly(**kwargs)
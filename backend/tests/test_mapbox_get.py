@@ -0,0 +1,43 @@
+"""mapbox_get: rate-limited GET on the shared Mapbox client, retried on 429."""
+
+import asyncio
+
+import httpx
+
+from services import foursquare
+
+
+class _StubClient:
+    """Returns the queued responses in order and records each requested URL."""
+
+    def __init__(self, responses: list[httpx.Response]):
+        self.responses = responses
+        self.urls: list[str] = []
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+def _response(status: int, **headers) -> httpx.Response:
+    return httpx.Response(status, headers=headers, request=httpx.Request("GET", "https://api.mapbox.com/x"))
+
+
+def test_retries_429_then_returns_response(monkeypatch):
+    stub = _StubClient([_response(429, **{"Retry-After": "0"}), _response(200)])
+    monkeypatch.setattr(foursquare, "get_client", lambda: stub)
+
+    resp = asyncio.run(foursquare.mapbox_get("https://api.mapbox.com/x", params={"limit": "1"}))
+
+    assert resp.status_code == 200
+    assert stub.urls == ["https://api.mapbox.com/x"] * 2
+
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    stub = _StubClient([_response(429, **{"Retry-After": "0"}) for _ in range(foursquare.MAPBOX_MAX_ATTEMPTS)])
+    monkeypatch.setattr(foursquare, "get_client", lambda: stub)
+
+    resp = asyncio.run(foursquare.mapbox_get("https://api.mapbox.com/x"))
+
+    assert resp.status_code == 429
+    assert len(stub.urls) == foursquare.MAPBOX_MAX_ATTEMPTS
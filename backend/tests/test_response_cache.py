@@ -0,0 +1,63 @@
+"""ResponseCache.fetch: stale copies are served only when the upstream is down."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from services.cache import ResponseCache
+
+
+class _DictCache(ResponseCache):
+    """ResponseCache over a plain dict instead of Redis."""
+
+    def __init__(self, data: dict):
+        super().__init__(None)
+        self.data = data
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ttl, stale=True):
+        self.data[key] = value
+        if stale:
+            self.data[f"stale:{key}"] = value
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", "https://besttime.app/api/v1/x")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status, request=request))
+
+
+def _failing(exc: Exception):
+    async def loader():
+        raise exc
+    return loader
+
+
+@pytest.mark.parametrize("exc", [_status_error(503), httpx.ReadTimeout("timeout"), httpx.ConnectError("refused")])
+def test_outage_serves_marked_stale_copy(exc):
+    cache = _DictCache({"stale:fw:v1": {"analysis": [1, 2]}})
+    data = asyncio.run(cache.fetch("fw:v1", 60, _failing(exc)))
+    assert data == {"analysis": [1, 2], "stale": True}
+
+
+@pytest.mark.parametrize("exc", [_status_error(401), _status_error(404), ValueError("bad payload")])
+def test_client_errors_propagate(exc):
+    cache = _DictCache({"stale:fw:v1": {"analysis": [1, 2]}})
+    with pytest.raises(type(exc)):
+        asyncio.run(cache.fetch("fw:v1", 60, _failing(exc)))
+
+
+def test_stale_false_neither_stores_nor_serves_stale():
+    cache = _DictCache({})
+
+    async def loader():
+        return {"live": 40}
+
+    assert asyncio.run(cache.fetch("live:v1", 60, loader, stale=False)) == {"live": 40}
+    assert "stale:live:v1" not in cache.data
+
+    cache.data = {"stale:live:v1": {"live": 40}}
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(cache.fetch("live:v1", 60, _failing(httpx.ReadTimeout("timeout")), stale=False))
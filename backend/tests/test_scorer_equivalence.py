@@ -0,0 +1,302 @@
+"""
+Scorer equivalence: fixed activities and the scores the original (pure-Python,
+pydantic) elderly and child scorers gave them. Guards the compiled/batched
+rewrites against drifting from those numbers and reasons.
+"""
+
+import dataclasses
+
+from services.child_scorer import rank_activities_for_children, score_activity_for_child
+from services.elderly_scorer import rank_activities_for_elderly, score_venue_for_elderly
+
+ELDERLY_ACTIVITIES = [
+    {"name": "Government Museum", "type": "museum", "busyness_pct": 20, "duration_minutes": 90},
+    {
+        "name": "Marina Beach Walk",
+        "category": "beach",
+        "is_outdoor": True,
+        "busyness_pct": 85,
+        "duration_minutes": 150,
+        "description": "A long walk along the sand",
+    },
+    {
+        "title": "Kodaikanal Trek",
+        "type": "hiking",
+        "is_outdoor": True,
+        "duration_minutes": 240,
+        "description": "Steep uphill trail with stairs, climb to the summit",
+    },
+    {
+        "name": "Filter Coffee Stop",
+        "type": "Cafe",
+        "busyness_pct": 55.5,
+        "duration_minutes": 30,
+        "has_seating": False,
+    },
+    {
+        "name": "Fort Ramparts",
+        "is_outdoor": True,
+        "distance_km": 4.2,
+        "estimated_steps": 6500,
+        "description": "Cycling and surf lessons nearby",
+    },
+    {
+        "name": "Kapaleeshwarar Temple",
+        "type": "temple",
+        "busyness_pct": 40,
+        "duration_minutes": 45,
+        "description": "Quiet spot to sit",
+    },
+]
+
+ELDERLY_EXPECTED = [
+    {
+        "name": "Government Museum",
+        "crowd_score": 80.0,
+        "walkability_score": 75.0,
+        "accessibility_score": 100.0,
+        "overall_score": 83.0,
+        "recommendation": "Highly Recommended",
+        "reasons": [
+            "Low crowd levels — comfortable for elderly visitors",
+            "~1,800 steps — light walking",
+            "Minimal physical effort required",
+            "Indoor venue — weather-protected",
+        ],
+    },
+    {
+        "name": "Marina Beach Walk",
+        "crowd_score": 15.0,
+        "walkability_score": 0.0,
+        "accessibility_score": 70.0,
+        "overall_score": 22.8,
+        "recommendation": "Not Recommended",
+        "reasons": [
+            "⚠️ High crowd levels — may be uncomfortable",
+            "⚠️ ~10,500 steps estimated — plan rest breaks and consider taxi",
+            "⚠️ ~7.5 km distance — consider taxi or auto-rickshaw",
+            "⚠️ Significant physical effort needed",
+            "Outdoor venue — check weather conditions",
+            "⚠️ Long duration (150 min) — plan rest breaks",
+        ],
+    },
+    {
+        "name": "Kodaikanal Trek",
+        "crowd_score": 50.0,
+        "walkability_score": 0.0,
+        "accessibility_score": 70.0,
+        "overall_score": 35.0,
+        "recommendation": "Use Caution",
+        "reasons": [
+            "ℹ️ Crowd data unavailable — score is estimated",
+            "⚠️ ~21,600 steps estimated — plan rest breaks and consider taxi",
+            "⚠️ ~14.0 km distance — consider taxi or auto-rickshaw",
+            "⚠️ Significant physical effort needed",
+            "Outdoor venue — check weather conditions",
+            "⚠️ Long duration (240 min) — plan rest breaks",
+        ],
+    },
+    {
+        "name": "Filter Coffee Stop",
+        "crowd_score": 44.5,
+        "walkability_score": 85.0,
+        "accessibility_score": 90.0,
+        "overall_score": 72.1,
+        "recommendation": "Suitable",
+        "reasons": [
+            "Moderate crowd levels (56% busy)",
+            "~600 steps — light walking",
+            "Minimal physical effort required",
+            "Indoor venue — weather-protected",
+        ],
+    },
+    {
+        "name": "Fort Ramparts",
+        "crowd_score": 50.0,
+        "walkability_score": 0.0,
+        "accessibility_score": 70.0,
+        "overall_score": 35.0,
+        "recommendation": "Use Caution",
+        "reasons": [
+            "ℹ️ Crowd data unavailable — score is estimated",
+            "⚠️ ~6,500 steps estimated — plan rest breaks and consider taxi",
+            "⚠️ ~4.2 km distance — consider taxi or auto-rickshaw",
+            "⚠️ Significant physical effort needed",
+            "Outdoor venue — check weather conditions",
+        ],
+    },
+    {
+        "name": "Kapaleeshwarar Temple",
+        "crowd_score": 60.0,
+        "walkability_score": 85.0,
+        "accessibility_score": 100.0,
+        "overall_score": 80.0,
+        "recommendation": "Highly Recommended",
+        "reasons": [
+            "Moderate crowd levels (40% busy)",
+            "~900 steps — light walking",
+            "Minimal physical effort required",
+            "Indoor venue — weather-protected",
+        ],
+    },
+]
+
+CHILD_ACTIVITIES = [
+    {
+        "name": "Wonderla Amusement Park",
+        "type": "amusement_park",
+        "is_outdoor": True,
+        "duration_minutes": 240,
+        "description": "Roller coaster, water slide and bumper car rides",
+    },
+    {
+        "name": "Arignar Anna Zoo",
+        "description": "See the lions and ride the toy train",
+        "is_outdoor": True,
+        "duration_minutes": 150,
+    },
+    {
+        "name": "Art Gallery Lecture",
+        "description": "A long lecture on renaissance painting",
+        "duration_minutes": 120,
+    },
+    {
+        "title": "Kovalam Beach",
+        "category": "beach",
+        "is_outdoor": True,
+        "duration_minutes": 90,
+        "description": "Splash in the waves and build sandcastles",
+    },
+    {"name": "Ice Cream Parlour", "duration_minutes": 30},
+    {"name": "Rooftop Bar", "description": "Cocktails and nightlife", "duration_minutes": 200},
+]
+
+CHILD_EXPECTED = {
+    "Wonderla Amusement Park": {
+        "name": "Wonderla Amusement Park",
+        "fun_score": 100.0,
+        "safety_score": 70.0,
+        "engagement_score": 95.0,
+        "overall_score": 91.0,
+        "recommendation": "Super Fun!",
+        "emoji": "🌟",
+        "reasons": [
+            "🎉 Kids will love this activity!",
+            "✅ Safe environment for children",
+            "⏰ Long duration (240 min) — pack snacks and activities",
+            "☀️ Outdoor — bring sunscreen, hats, and water",
+        ],
+        "suggested_alternative": None,
+    },
+    "Arignar Anna Zoo": {
+        "name": "Arignar Anna Zoo",
+        "fun_score": 89.0,
+        "safety_score": 70.0,
+        "engagement_score": 95.0,
+        "overall_score": 86.1,
+        "recommendation": "Super Fun!",
+        "emoji": "🌟",
+        "reasons": [
+            "🎉 Kids will love this activity!",
+            "✅ Safe environment for children",
+            "⏰ Long duration (150 min) — pack snacks and activities",
+            "☀️ Outdoor — bring sunscreen, hats, and water",
+        ],
+        "suggested_alternative": None,
+    },
+    "Kovalam Beach": {
+        "name": "Kovalam Beach",
+        "fun_score": 87.0,
+        "safety_score": 65.0,
+        "engagement_score": 80.0,
+        "overall_score": 79.4,
+        "recommendation": "Super Fun!",
+        "emoji": "🌟",
+        "reasons": [
+            "🎉 Kids will love this activity!",
+            "☀️ Outdoor — bring sunscreen, hats, and water",
+        ],
+        "suggested_alternative": None,
+    },
+    "Ice Cream Parlour": {
+        "name": "Ice Cream Parlour",
+        "fun_score": 87.0,
+        "safety_score": 80.0,
+        "engagement_score": 65.0,
+        "overall_score": 78.7,
+        "recommendation": "Super Fun!",
+        "emoji": "🌟",
+        "reasons": [
+            "🎉 Kids will love this activity!",
+            "✅ Safe environment for children",
+            "⚡ Perfect duration for kids' attention span",
+        ],
+        "suggested_alternative": None,
+    },
+    "Art Gallery Lecture": {
+        "name": "Art Gallery Lecture",
+        "fun_score": 35.0,
+        "safety_score": 80.0,
+        "engagement_score": 30.0,
+        "overall_score": 44.8,
+        "recommendation": "Okay",
+        "emoji": "⭐",
+        "reasons": ["✅ Safe environment for children"],
+        "suggested_alternative": "🎪 Find a kid-friendly attraction near Art Gallery Lecture",
+    },
+    "Rooftop Bar": {
+        "name": "Rooftop Bar",
+        "fun_score": 10.0,
+        "safety_score": 80.0,
+        "engagement_score": 30.0,
+        "overall_score": 33.5,
+        "recommendation": "Not for Kids",
+        "emoji": "⭐",
+        "reasons": [
+            "😴 Might not hold kids' interest",
+            "✅ Safe environment for children",
+            "⏰ Long duration (200 min) — pack snacks and activities",
+        ],
+        "suggested_alternative": "🎪 Find a kid-friendly attraction near Rooftop Bar",
+    },
+}
+
+
+def _score_elderly(a: dict):
+    return score_venue_for_elderly(
+        name=a.get("name") or a.get("title", "Unknown"),
+        busyness_pct=a.get("busyness_pct"),
+        is_outdoor=a.get("is_outdoor", False),
+        duration_minutes=a.get("duration_minutes"),
+        venue_type=a.get("type") or a.get("category"),
+        description=a.get("description"),
+        has_seating=a.get("has_seating", True),
+        distance_km=a.get("distance_km"),
+        estimated_steps=a.get("estimated_steps"),
+    )
+
+
+def test_elderly_single_matches_baseline():
+    assert [dataclasses.asdict(_score_elderly(a)) for a in ELDERLY_ACTIVITIES] == ELDERLY_EXPECTED
+
+
+def test_elderly_batch_ranking_matches_baseline():
+    ranked = [dataclasses.asdict(v) for v in rank_activities_for_elderly(ELDERLY_ACTIVITIES)]
+    assert ranked == sorted(ELDERLY_EXPECTED, key=lambda v: v["overall_score"], reverse=True)
+
+
+def test_child_single_matches_baseline():
+    for a in CHILD_ACTIVITIES:
+        score = score_activity_for_child(
+            name=a.get("name") or a.get("title", "Unknown"),
+            description=a.get("description"),
+            is_outdoor=a.get("is_outdoor", False),
+            duration_minutes=a.get("duration_minutes"),
+            venue_type=a.get("type") or a.get("category"),
+        )
+        assert dataclasses.asdict(score) == CHILD_EXPECTED[score.name]
+
+
+def test_child_batch_ranking_matches_baseline():
+    ranked = [dataclasses.asdict(v) for v in rank_activities_for_children(CHILD_ACTIVITIES)]
+    assert ranked == list(CHILD_EXPECTED.values())
@@ -5,19 +5,26 @@ Runs independently on port 8001 and serves a self-injecting JS widget.
 Run:  python -m uvicorn main:app --port 8001 --reload
 """
 
+import asyncio
+import hashlib
 import os
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import httpx
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent"
 
 SYSTEM_PROMPT = """You are RoamIQ Travel Assistant — a friendly, knowledgeable travel chatbot.
 You help travelers with:
@@ -31,7 +38,120 @@ Keep responses concise (2-4 paragraphs max), warm, and practical.
 Use relevant emojis sparingly. If you don't know something, say so honestly.
 Always be helpful and enthusiastic about travel!"""
 
-app = FastAPI(title="RoamIQ Chatbot", version="1.0.0")
+# Static prefix of every Gemini conversation
+_BASE_CONTENTS: tuple[dict, ...] = (
+    {"role": "user", "parts": [{"text": SYSTEM_PROMPT}]},
+    {"role": "model", "parts": [{"text": "Understood! I'm RoamIQ Travel Assistant, ready to help with all your travel questions. 🌍"}]},
+)
+
+_GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "maxOutputTokens": 512,
+    "topP": 0.9,
+}
+
+# The request body up to the per-chat messages, serialized once at import.
+# Each request only encodes its history + message and splices them on.
+_BODY_HEAD = (
+    b'{"generationConfig":' + orjson.dumps(_GENERATION_CONFIG)
+    + b',"contents":[' + b",".join(orjson.dumps(c) for c in _BASE_CONTENTS)
+)
+
+# ── Reply cache ───────────────────────────────────────────────
+# Identical conversations (same history + message) get the stored reply
+# instead of another 1–3 s Gemini call. SQLite on disk, so it survives
+# restarts; least recently used rows are pruned once the table grows past
+# GEMINI_CACHE_MAX_ROWS (checked every ReplyCache.PRUNE_EVERY inserts).
+GEMINI_CACHE_PATH = os.getenv("GEMINI_CACHE_PATH", ".gemini_cache.sqlite3")
+GEMINI_CACHE_MAX_ROWS = 5000
+
+
+class ReplyCache:
+    """
+    SQLite calls run in a worker thread (one at a time, under a lock), so a
+    slow disk never stalls the event loop or other chats' streams.
+    """
+
+    # Only check the row count every PRUNE_EVERY inserts
+    PRUNE_EVERY = 100
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.inserts = 0
+        # WAL + NORMAL: commits append to the log instead of an fsync each
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, reply TEXT NOT NULL, ts INTEGER NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS replies_ts ON replies (ts)")
+        self.db.commit()
+
+    @staticmethod
+    def key(body: bytes) -> str:
+        return hashlib.blake2b(body).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, reply: str):
+        await asyncio.to_thread(self._set, key, reply)
+
+    def _get(self, key: str) -> str | None:
+        with self.lock:
+            row = self.db.execute("SELECT reply FROM replies WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE replies SET ts = ? WHERE key = ?", (int(time.time()), key))
+            self.db.commit()
+            return row[0]
+
+    def _set(self, key: str, reply: str):
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO replies (key, reply, ts) VALUES (?, ?, ?)",
+                (key, reply, int(time.time())),
+            )
+            self.inserts += 1
+            if self.inserts % self.PRUNE_EVERY == 0:
+                self._prune()
+            self.db.commit()
+
+    def _prune(self):
+        """Drop the least recently used rows past GEMINI_CACHE_MAX_ROWS (walks the ts index)."""
+        (count,) = self.db.execute("SELECT COUNT(*) FROM replies").fetchone()
+        if count > GEMINI_CACHE_MAX_ROWS:
+            self.db.execute(
+                "DELETE FROM replies WHERE key IN (SELECT key FROM replies ORDER BY ts LIMIT ?)",
+                (count - GEMINI_CACHE_MAX_ROWS,),
+            )
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled Gemini client for all chats — no handshake per message
+    app.state.gemini_client = httpx.AsyncClient(
+        timeout=30,
+        http2=True,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+    )
+    app.state.reply_cache = ReplyCache(GEMINI_CACHE_PATH)
+    yield
+    await app.state.gemini_client.aclose()
+    app.state.reply_cache.close()
+
+
+app = FastAPI(
+    title="RoamIQ Chatbot",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -49,58 +169,89 @@ class ChatRequest(BaseModel):
     history: list[dict] = []
 
 
-class ChatResponse(BaseModel):
-    reply: str
-    error: str | None = None
+# ── Chat endpoint ─────────────────────────────────────────────
+# Replies stream as Server-Sent Events so the widget can show the first words
+# while Gemini is still generating. Events: data: {"text": "..."} chunks,
+# data: {"error": "..."} on failure, and a final data: [DONE].
 
+def _sse(payload: dict) -> bytes:
+    return b"data: " + orjson.dumps(payload) + b"\n\n"
+
+
+def _event_stream(events):
+    return StreamingResponse(events, media_type="text/event-stream")
+
+
+async def _single_event(**payload):
+    yield _sse(payload)
+    if "error" not in payload:
+        yield b"data: [DONE]\n\n"
 
-# ── Chat endpoint ─────────────────────────────────────────────
 
 @app.post("/api/chat")
-async def chat(req: ChatRequest):
+async def chat(req: ChatRequest, request: Request, no_cache: bool = False):
     if not GEMINI_API_KEY:
-        return ChatResponse(
-            reply="",
+        return _event_stream(_single_event(
             error="GEMINI_API_KEY not set in chatbot/.env — add it to enable the chatbot.",
-        )
+        ))
 
-    contents = []
-    contents.append({"role": "user", "parts": [{"text": SYSTEM_PROMPT}]})
-    contents.append({
-        "role": "model",
-        "parts": [{"text": "Understood! I'm RoamIQ Travel Assistant, ready to help with all your travel questions. 🌍"}],
-    })
+    contents = [
+        {"role": "user" if msg.get("role") == "user" else "model", "parts": [{"text": msg.get("content", "")}]}
+        for msg in req.history[-10:]
+    ]
+    contents.append({"role": "user", "parts": [{"text": req.message}]})
+    body = _BODY_HEAD + b"," + orjson.dumps(contents)[1:-1] + b"]}"
 
-    for msg in req.history[-10:]:
-        role = "user" if msg.get("role") == "user" else "model"
-        contents.append({"role": role, "parts": [{"text": msg.get("content", "")}]})
+    # ?no_cache=1 skips the lookup (the fresh reply is still stored)
+    cache = request.app.state.reply_cache
+    cache_key = cache.key(body)
+    if not no_cache:
+        cached = await cache.get(cache_key)
+        if cached is not None:
+            return _event_stream(_single_event(text=cached))
 
-    contents.append({"role": "user", "parts": [{"text": req.message}]})
+    client = request.app.state.gemini_client
+    return _event_stream(_stream_reply(client, body, cache, cache_key))
 
+
+async def _stream_reply(client: httpx.AsyncClient, body: bytes, cache: ReplyCache, cache_key: str):
+    """Proxy Gemini's SSE stream as text chunks; cache the full reply once complete."""
+    parts: list[str] = []
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(
-                f"{GEMINI_URL}?key={GEMINI_API_KEY}",
-                json={
-                    "contents": contents,
-                    "generationConfig": {
-                        "temperature": 0.7,
-                        "maxOutputTokens": 512,
-                        "topP": 0.9,
-                    },
-                },
-            )
-            data = resp.json()
-
-            if "candidates" in data and data["candidates"]:
-                text = data["candidates"][0]["content"]["parts"][0]["text"]
-                return ChatResponse(reply=text)
-            elif "error" in data:
-                return ChatResponse(reply="", error=data["error"].get("message", "Gemini API error"))
-            else:
-                return ChatResponse(reply="", error="No response from Gemini")
+        async with client.stream(
+            "POST",
+            f"{GEMINI_URL}?alt=sse&key={GEMINI_API_KEY}",
+            content=body,
+            headers={"Content-Type": "application/json"},
+        ) as resp:
+            if resp.status_code != 200:
+                data = orjson.loads(await resp.aread())
+                if isinstance(data, list):
+                    data = data[0] if data else {}
+                yield _sse({"error": data.get("error", {}).get("message", "Gemini API error")})
+                return
+
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                candidates = orjson.loads(line[5:]).get("candidates")
+                if not candidates:
+                    continue
+                text = "".join(
+                    p.get("text", "") for p in candidates[0].get("content", {}).get("parts", [])
+                )
+                if text:
+                    parts.append(text)
+                    yield _sse({"text": text})
     except Exception as e:
-        return ChatResponse(reply="", error=str(e))
+        yield _sse({"error": str(e)})
+        return
+
+    if not parts:
+        yield _sse({"error": "No response from Gemini"})
+        return
+    await cache.set(cache_key, "".join(parts))
+    yield b"data: [DONE]\n\n"
 
 
 # ── Serve widget JS ──────────────────────────────────────────
@@ -396,12 +396,42 @@
                 headers: { "Content-Type": "application/json" },
                 body: JSON.stringify({ message: text, history }),
             });
-            const data = await res.json();
+            if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
 
-            if (data.error) {
-                messages.push({ role: "assistant", content: "⚠️ " + data.error });
-            } else {
-                messages.push({ role: "assistant", content: data.reply });
+            // Server-Sent Events: append each text chunk to the reply as it arrives
+            // (pushed on the first event so a failed request doesn't leave an empty bubble)
+            const reply = { role: "assistant", content: "" };
+            const reader = res.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = "";
+            let finished = false;
+            while (!finished) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split("\n\n");
+                buffer = events.pop();
+                for (const event of events) {
+                    if (!event.startsWith("data:")) continue;
+                    const payload = event.slice(5).trim();
+                    if (payload === "[DONE]") {
+                        finished = true;
+                        break;
+                    }
+                    const data = JSON.parse(payload);
+                    if (!messages.includes(reply)) messages.push(reply);
+                    if (data.error) {
+                        reply.content = "⚠️ " + data.error;
+                        finished = true;
+                        break;
+                    }
+                    reply.content += data.text;
+                    isLoading = false;
+                    render();
+                }
+            }
+            if (!messages.includes(reply)) {
+                messages.push({ role: "assistant", content: "⚠️ No response from the assistant." });
             }
         } catch (err) {
             messages.push({